@@ -0,0 +1 @@
+"""Mailmap benchmarks, kept out of the default test run."""
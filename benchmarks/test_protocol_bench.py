@@ -0,0 +1,30 @@
+"""Benchmarks for protocol message (de)serialization.
+
+Every WebSocket message goes through these paths. Skipped unless
+pytest-benchmark is installed.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from mailmap.protocol import Request, Response, ServerEvent, parse_message  # noqa: E402
+
+
+@pytest.mark.parametrize("raw,expected_type", [
+    ('{"id": "1", "action": "ping", "params": {}}', Request),
+    ('{"id": "1", "ok": true, "result": {"folders": ["Inbox", "Sent"]}}', Response),
+], ids=["request", "response"])
+def test_parse_message(benchmark, raw, expected_type):
+    msg = benchmark(parse_message, raw)
+    assert isinstance(msg, expected_type)
+
+
+@pytest.mark.parametrize("message", [
+    Request(id="1", action="ping", params={}, token="secret"),
+    Response.success("1", {"folders": ["Inbox", "Sent"]}),
+    ServerEvent(event="emailClassified", data={"folder": "Inbox", "confidence": 0.95}),
+], ids=["request", "response", "server-event"])
+def test_to_json(benchmark, message):
+    raw = benchmark(message.to_json)
+    assert raw.startswith("{")
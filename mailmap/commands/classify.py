@@ -15,7 +15,7 @@ from ..database import Database, Email
 from ..email import UnifiedEmail
 from ..llm import OllamaClient
 from ..mbox import get_raw_email
-from ..spam import is_spam, parse_rules
+from ..spam import compile_rules, parse_rules
 from ..targets.base import EmailTarget
 
 logger = logging.getLogger("mailmap")
@@ -348,6 +348,7 @@ async def bulk_classify(
 
     # Load spam rules
     spam_rules = parse_rules(config.spam.rules) if config.spam.enabled else []
+    check_spam = compile_rules(spam_rules)
 
     stats = ProcessingStats()
     start_time = time.time()
@@ -417,7 +418,7 @@ async def bulk_classify(
                         # Check for spam (if headers available)
                         is_spam_result, spam_reason = False, None
                         if spam_rules and email.headers:
-                            is_spam_result, spam_reason = is_spam(email.headers, spam_rules)
+                            is_spam_result, spam_reason = check_spam(email.headers)
 
                         if is_spam_result:
                             email_record = Email(
@@ -126,10 +126,7 @@ def sync_transfers(config: Config, db: Database, dry_run: bool = False) -> None:
     from ..categories import load_categories
     from ..imap_client import ImapMailbox
 
-    db.connect()
-    db.init_schema()
-
-    try:
+    with db:
         # Load categories to know which folders to scan
         categories_path = Path(config.database.categories_file)
         categories = load_categories(categories_path)
@@ -209,9 +206,6 @@ def sync_transfers(config: Config, db: Database, dry_run: bool = False) -> None:
         finally:
             mailbox.disconnect()
 
-    finally:
-        db.close()
-
 
 def dedup_folders(config: Config, dry_run: bool = False) -> int:
     """Remove duplicate emails from category folders on IMAP.
@@ -78,6 +78,11 @@ class WebSocketConfig:
         if env_token:
             self.auth_token = env_token
 
+    @property
+    def url(self) -> str:
+        """WebSocket URL clients use to reach the server."""
+        return f"ws://{self.host}:{self.port}"
+
 
 # Default spam rules covering common spam filters
 DEFAULT_SPAM_RULES = [
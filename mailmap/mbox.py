@@ -2,6 +2,7 @@
 
 import logging
 import mailbox
+import os
 from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
@@ -90,27 +91,37 @@ class ThunderbirdEmail:
 
 def list_mbox_files(mail_dir: Path) -> list[tuple[str, Path]]:
     """List all mbox files in a mail directory, returning (folder_name, path) tuples."""
-    mbox_files = []
+    mbox_files: list[tuple[str, Path]] = []
+    if mail_dir.is_dir():
+        _scan_mail_dir(mail_dir, [], mbox_files)
+    return mbox_files
+
+
+def _scan_mail_dir(
+    directory: str | Path, parents: list[str], mbox_files: list[tuple[str, Path]]
+) -> None:
+    """Collect mbox files from one directory level, recursing into subdirectories.
 
-    for item in mail_dir.rglob("*"):
+    Uses a single os.scandir per directory; DirEntry caches file type, so
+    .msf companions are checked against the listing instead of with stat calls.
+    Symlinked mbox files are followed, symlinked directories are not.
+    """
+    with os.scandir(directory) as it:
+        entries = list(it)
+    names = {entry.name for entry in entries}
+
+    for entry in entries:
+        name = entry.name
+        if entry.is_dir(follow_symlinks=False):
+            # Handle .sbd subdirectories (Thunderbird's subfolder convention)
+            folder = name[:-4] if name.endswith(".sbd") else name
+            _scan_mail_dir(entry.path, [*parents, folder], mbox_files)
         # mbox files have no extension, skip .msf (index) and .dat files
-        if item.is_file() and not item.suffix and not item.name.startswith("."):
+        elif "." not in name and entry.is_file():
             # Check if it looks like an mbox file (has corresponding .msf or is non-empty)
-            msf_file = item.with_suffix(".msf")
-            if msf_file.exists() or item.stat().st_size > 0:
-                # Derive folder name from path relative to mail_dir
-                rel_path = item.relative_to(mail_dir)
-                # Handle .sbd subdirectories (Thunderbird's subfolder convention)
-                parts = []
-                for part in rel_path.parts:
-                    if part.endswith(".sbd"):
-                        parts.append(part[:-4])  # Remove .sbd suffix
-                    else:
-                        parts.append(part)
-                folder_name = "/".join(parts)
-                mbox_files.append((folder_name, item))
-
-    return mbox_files
+            if f"{name}.msf" in names or entry.stat().st_size > 0:
+                folder_name = "/".join([*parents, name])
+                mbox_files.append((folder_name, Path(entry.path)))
 
 
 def _open_mbox(mbox_path: Path) -> mailbox.mbox | None:
@@ -1,6 +1,7 @@
 """Thunderbird profile detection and parsing utilities."""
 
 import configparser
+import functools
 import logging
 import re
 from pathlib import Path
@@ -67,6 +68,11 @@ def find_imap_mail_dirs(profile_path: Path) -> list[Path]:
 def parse_prefs_js(profile_path: Path) -> dict[str, str]:
     """Parse Thunderbird's prefs.js file into a dict of preferences.
 
+    Results are cached per file, keyed on its modification time, size and
+    inode, so repeated calls only re-read prefs.js after Thunderbird rewrites
+    it. Thunderbird replaces the file by rename, which changes the inode even
+    when the timestamp resolution is too coarse to notice the write.
+
     Args:
         profile_path: Path to the Thunderbird profile directory
 
@@ -74,9 +80,18 @@ def parse_prefs_js(profile_path: Path) -> dict[str, str]:
         Dict of preference name -> value
     """
     prefs_path = profile_path / "prefs.js"
-    if not prefs_path.exists():
+    try:
+        st = prefs_path.stat()
+    except OSError:
         return {}
 
+    # Copy so callers can't mutate the cached result
+    return dict(_parse_prefs_file(prefs_path, (st.st_mtime_ns, st.st_size, st.st_ino)))
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_prefs_file(prefs_path: Path, version: tuple[int, int, int]) -> dict[str, str]:
+    """Parse a prefs.js file; version (mtime_ns, size, inode) is only part of the cache key."""
     prefs = {}
 
     # Pattern: user_pref("key", value);
@@ -14,8 +14,11 @@ Examples:
 """
 
 import contextlib
+import functools
 import re
-from dataclasses import dataclass
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
@@ -42,6 +45,12 @@ class SpamRule:
     operator: Operator
     value: Any = None  # number, string, or list
     pattern: re.Pattern | None = None  # regex for extraction
+    members: frozenset[str] | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Set form of an 'in' value list for O(1) membership checks
+        if isinstance(self.value, list):
+            self.members = frozenset(self.value)
 
     def __str__(self) -> str:
         parts = [self.header]
@@ -131,10 +140,12 @@ def parse_rule(rule: str) -> SpamRule:
         except ValueError as e:
             raise RuleParseError(f"Invalid numeric value '{tokens[0]}': {rule}") from e
     else:
-        # String value (rest of tokens)
+        # String value (rest of tokens), interned so identical values across
+        # rules share one object; header values are not interned, so
+        # comparisons against them still compare characters
         if not tokens:
             raise RuleParseError(f"Missing string value: {rule}")
-        value = " ".join(tokens)
+        value = sys.intern(" ".join(tokens))
 
     return SpamRule(header=header, operator=operator, value=value, pattern=pattern)
 
@@ -251,7 +262,7 @@ def check_rule(rule: SpamRule, headers: dict[str, str]) -> bool:
     elif rule.operator == Operator.CONTAINS:
         return rule.value in header_value
     elif rule.operator == Operator.IN:
-        return header_value in rule.value
+        return header_value in rule.members
 
     return False
 
@@ -272,6 +283,35 @@ def is_spam(headers: dict[str, str], rules: list[SpamRule]) -> tuple[bool, str |
     return False, None
 
 
+def compile_rules(
+    rules: list[SpamRule], maxsize: int = 1024
+) -> Callable[[dict[str, str]], tuple[bool, str | None]]:
+    """Build a memoized spam checker for a fixed rule set.
+
+    Results are cached on the values of the headers the rules reference, so
+    bulk mail sharing the same spam headers is only evaluated once.
+
+    Args:
+        rules: List of spam rules to check
+        maxsize: Maximum number of header fingerprints to cache
+
+    Returns:
+        Callable taking headers and returning (is_spam, matching_rule_str or None)
+    """
+    relevant = frozenset(rule.header.lower() for rule in rules)
+
+    @functools.lru_cache(maxsize=maxsize)
+    def _check(fingerprint: tuple[tuple[str, str], ...]) -> tuple[bool, str | None]:
+        return is_spam(dict(fingerprint), rules)
+
+    def check(headers: dict[str, str]) -> tuple[bool, str | None]:
+        folded = {k.lower(): v for k, v in headers.items()}
+        fingerprint = tuple(sorted((h, folded[h]) for h in relevant if h in folded))
+        return _check(fingerprint)
+
+    return check
+
+
 def parse_rules(rule_strings: list[str]) -> list[SpamRule]:
     """Parse a list of rule strings into SpamRule objects.
 
@@ -17,11 +17,17 @@ from .websocket import WebSocketTarget
 __all__ = [
     "EmailTarget",
     "ImapTarget",
+    "WebSocketRequiredError",
     "WebSocketTarget",
     "select_target",
 ]
 
 
+class WebSocketRequiredError(ValueError):
+    """Target account requires a WebSocket connection but none was requested."""
+    pass
+
+
 def select_target(
     config: Config,
     target_account: str = "local",
@@ -48,7 +54,7 @@ def select_target(
         An EmailTarget instance (not yet connected)
 
     Raises:
-        ValueError: If target account requires WebSocket but not available
+        WebSocketRequiredError: If target account requires WebSocket but not available
     """
     # "imap" always uses direct IMAP
     if target_account == "imap":
@@ -57,7 +63,7 @@ def select_target(
     # "local" requires WebSocket
     if target_account == "local":
         if websocket_port is None:
-            raise ValueError(
+            raise WebSocketRequiredError(
                 "Target 'local' requires --websocket.\n"
                 "Use --websocket to enable, or use --target-account imap for direct IMAP."
             )
@@ -5,6 +5,7 @@ import logging
 import uuid
 from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs, urlsplit
 
 import websockets
 from websockets.asyncio.server import Server, ServerConnection
@@ -28,6 +29,10 @@ class WebSocketServer:
         self._pending_requests: dict[str, asyncio.Future[Response]] = {}
         self._server: Server | None = None
         self._running = False
+        # Set while at least one client is connected
+        self.connected_event = asyncio.Event()
+        # Set once the server is listening
+        self.ready_event = asyncio.Event()
 
     async def start(self) -> None:
         """Start the WebSocket server."""
@@ -39,6 +44,7 @@ class WebSocketServer:
             self.config.host,
             self.config.port,
         )
+        self.ready_event.set()
 
         # Keep running until stopped
         while self._running:
@@ -47,6 +53,7 @@ class WebSocketServer:
     async def stop(self) -> None:
         """Stop the WebSocket server."""
         self._running = False
+        self.ready_event.clear()
         if self._server:
             self._server.close()
             await self._server.wait_closed()
@@ -63,10 +70,12 @@ class WebSocketServer:
         # aren't possible anyway.
 
         self._clients[client_id] = websocket
+        self.connected_event.set()
         logger.info(f"Client {client_id} connected from {websocket.remote_address}")
 
-        # Send connected event
-        await self._send_event(websocket, Event.CONNECTED, {"clientId": client_id})
+        # Send connected event, unless the client asked for a silent connection
+        if not self._is_silent(websocket):
+            await self._send_event(websocket, Event.CONNECTED, {"clientId": client_id})
 
         try:
             async for message in websocket:
@@ -77,6 +86,16 @@ class WebSocketServer:
             logger.info(f"Client {client_id} disconnected")
         finally:
             del self._clients[client_id]
+            if not self._clients:
+                self.connected_event.clear()
+
+    @staticmethod
+    def _is_silent(websocket: ServerConnection) -> bool:
+        """Return True if the client connected with ?silent=1 (skips the connected event)."""
+        if websocket.request is None:
+            return False
+        query = parse_qs(urlsplit(websocket.request.path).query)
+        return query.get("silent") == ["1"]
 
     async def _handle_message(
         self, client_id: str, websocket: ServerConnection, raw: str
@@ -188,11 +207,15 @@ class WebSocketServer:
         server_event = ServerEvent(event=event.value, data=data)
         message = server_event.to_json()
 
-        for client_id, websocket in list(self._clients.items()):
-            try:
-                await websocket.send(message)
-            except Exception as e:
-                logger.warning(f"Failed to send event to {client_id}: {e}")
+        # Send to all clients concurrently; one slow client doesn't delay the rest
+        clients = list(self._clients.items())
+        results = await asyncio.gather(
+            *(websocket.send(message) for _, websocket in clients),
+            return_exceptions=True,
+        )
+        for (client_id, _), result in zip(clients, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send event to {client_id}: {result}")
 
     async def _send_event(
         self, websocket: ServerConnection, event: Event, data: dict[str, Any]
@@ -238,16 +261,16 @@ async def start_websocket_and_wait(
     server = WebSocketServer(config, db, categories_file)
     server_task = asyncio.create_task(server.start())
 
-    logger.info(f"WebSocket server started on ws://{config.host}:{config.port}")
+    logger.info(f"WebSocket server started on {config.url}")
     logger.info("Waiting for Thunderbird extension to connect...")
 
-    for _ in range(timeout):
-        if server.is_connected:
-            logger.info("Extension connected!")
-            return server, server_task
-        await asyncio.sleep(1)
+    try:
+        await asyncio.wait_for(server.connected_event.wait(), timeout)
+    except TimeoutError:
+        logger.error("Timeout waiting for extension to connect")
+        await server.stop()
+        server_task.cancel()
+        return None
 
-    logger.error("Timeout waiting for extension to connect")
-    await server.stop()
-    server_task.cancel()
-    return None
+    logger.info("Extension connected!")
+    return server, server_task
@@ -1,67 +1,104 @@
 """Shared test fixtures."""
 
-import mailbox
-import tempfile
+import asyncio
+import os
+import shutil
+import sys
 from pathlib import Path
 
 import pytest
 
-from mailmap.config import Config, DatabaseConfig, ImapConfig, OllamaConfig, ThunderbirdConfig
+from mailmap.config import (
+    Config,
+    DatabaseConfig,
+    ImapConfig,
+    OllamaConfig,
+    ThunderbirdConfig,
+    WebSocketConfig,
+)
 from mailmap.database import Database
 
+_TMPFS = Path("/dev/shm")
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
 
+def pytest_configure(config):
+    """Keep pytest's scratch directories on tmpfs when it is available.
+
+    Fixture files are tiny scratch data, so there is no reason to pay for disk
+    writes. Only pytest's own base directory moves; tempfile is left alone for
+    the code under test. An explicit --basetemp, TMPDIR or
+    PYTEST_DEBUG_TEMPROOT always wins.
+    """
+    if config.option.basetemp or os.environ.get("TMPDIR"):
+        return
+    if _TMPFS.is_dir() and os.access(_TMPFS, os.W_OK):
+        # Read lazily by pytest when it creates its numbered base directory
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", str(_TMPFS))
 
-@pytest.fixture
-def mock_thunderbird_profile(temp_dir):
-    """Create a mock Thunderbird profile structure."""
-    profile = temp_dir / "mock.default"
-    profile.mkdir()
 
-    # Create ImapMail directory with a mock server
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is available."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
+
+
+@pytest.fixture
+def temp_dir(tmp_path):
+    """Create a temporary directory for test files."""
+    return tmp_path
+
+
+_MOCK_INBOX = (
+    b"From test@example.com Mon Jan  1 00:00:00 2024\n"
+    b"Message-ID: <test1@example.com>\n"
+    b"From: sender@example.com\n"
+    b"Subject: Test Subject 1\n"
+    b"\n"
+    b"This is the body of test email 1.\n"
+    b"\n"
+    b"From test@example.com Mon Jan  1 00:00:01 2024\n"
+    b"Message-ID: <test2@example.com>\n"
+    b"From: another@example.com\n"
+    b"Subject: Test Subject 2\n"
+    b"\n"
+    b"This is the body of test email 2.\n"
+)
+
+
+def _materialize(root: Path, spec: dict[str, bytes | None]) -> None:
+    """Create a directory tree from a flat spec.
+
+    Keys are POSIX paths relative to root. A trailing "/" marks a directory,
+    None an empty file, and bytes the file contents. Each distinct parent
+    directory is created only once.
+    """
+    dirs = {root / key for key in spec if key.endswith("/")}
+    dirs.update((root / key).parent for key in spec if not key.endswith("/"))
+    for d in sorted(dirs, key=lambda d: len(d.parts)):
+        os.makedirs(d, exist_ok=True)
+
+    for key, content in spec.items():
+        if key.endswith("/"):
+            continue
+        path = root / key
+        if content is None:
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC))
+        else:
+            path.write_bytes(content)
+
+
+def _prefs_js(profile: Path) -> bytes:
+    """Render the mock profile's prefs.js with server directories under profile."""
     imap_mail = profile / "ImapMail" / "imap.example.com"
-    imap_mail.mkdir(parents=True)
-
-    # Create mock mbox files
-    inbox_mbox = imap_mail / "INBOX"
-    sent_mbox = imap_mail / "Sent"
-
-    # Create a simple mbox with test messages
-    mbox = mailbox.mbox(inbox_mbox)
-    msg1 = mailbox.mboxMessage()
-    msg1["Message-ID"] = "<test1@example.com>"
-    msg1["From"] = "sender@example.com"
-    msg1["Subject"] = "Test Subject 1"
-    msg1.set_payload("This is the body of test email 1.")
-    mbox.add(msg1)
-
-    msg2 = mailbox.mboxMessage()
-    msg2["Message-ID"] = "<test2@example.com>"
-    msg2["From"] = "another@example.com"
-    msg2["Subject"] = "Test Subject 2"
-    msg2.set_payload("This is the body of test email 2.")
-    mbox.add(msg2)
-    mbox.close()
-
-    # Create empty Sent mbox
-    sent_mbox.touch()
-
-    # Create .msf files (index files that Thunderbird creates)
-    (imap_mail / "INBOX.msf").touch()
-    (imap_mail / "Sent.msf").touch()
-
-    # Create Local Folders directory
     local_folders = profile / "Mail" / "Local Folders"
-    local_folders.mkdir(parents=True)
 
-    # Create prefs.js with account mappings
-    prefs_js = profile / "prefs.js"
-    prefs_js.write_text(f'''// Mozilla User Preferences
+    return f'''// Mozilla User Preferences
 user_pref("mail.account.account1.server", "server1");
 user_pref("mail.account.account2.server", "server2");
 user_pref("mail.accountmanager.accounts", "account1,account2");
@@ -71,11 +108,89 @@ user_pref("mail.server.server1.hostname", "imap.example.com");
 user_pref("mail.server.server1.type", "imap");
 user_pref("mail.server.server2.directory", "{local_folders}");
 user_pref("mail.server.server2.type", "none");
-''')
+'''.encode()
+
+
+@pytest.fixture(scope="session")
+def _thunderbird_template(tmp_path_factory):
+    """Build the mock Thunderbird profile once per session."""
+    profile = tmp_path_factory.mktemp("tb_template") / "mock.default"
+
+    _materialize(profile, {
+        # INBOX with two messages, empty Sent, and Thunderbird's .msf index files
+        "ImapMail/imap.example.com/INBOX": _MOCK_INBOX,
+        "ImapMail/imap.example.com/Sent": None,
+        "ImapMail/imap.example.com/INBOX.msf": None,
+        "ImapMail/imap.example.com/Sent.msf": None,
+        "Mail/Local Folders/": None,
+        "prefs.js": _prefs_js(profile),
+    })
+
+    return profile
+
 
+@pytest.fixture(scope="session")
+def readonly_thunderbird_profile(_thunderbird_template):
+    """Shared mock Thunderbird profile for tests that only read it."""
+    return _thunderbird_template
+
+
+@pytest.fixture
+def mock_thunderbird_profile(temp_dir, _thunderbird_template):
+    """Create a private, writable copy of the mock Thunderbird profile.
+
+    prefs.js is rewritten so its server directories point into the copy.
+    Each xdist worker builds its own template, so copies never cross workers.
+    """
+    profile = shutil.copytree(_thunderbird_template, temp_dir / "mock.default")
+    (profile / "prefs.js").write_bytes(_prefs_js(profile))
+    return profile
+
+
+@pytest.fixture(scope="session")
+def mock_profile_with_subfolders(tmp_path_factory):
+    """Create a shared mock profile with nested subfolders."""
+    profile = tmp_path_factory.mktemp("tb_nested") / "nested.default"
+    _materialize(profile, {
+        "ImapMail/imap.test.com/INBOX": None,
+        "ImapMail/imap.test.com/INBOX.msf": None,
+        # Subfolder using .sbd convention
+        "ImapMail/imap.test.com/INBOX.sbd/Work": None,
+        "ImapMail/imap.test.com/INBOX.sbd/Work.msf": None,
+    })
     return profile
 
 
+@pytest.fixture(scope="session")
+def mock_profile_multiple_accounts(tmp_path_factory):
+    """Create a shared mock profile with multiple IMAP accounts having the same folder."""
+    profile = tmp_path_factory.mktemp("tb_multi") / "multi.default"
+    _materialize(profile, {
+        "ImapMail/imap.gmail.com/INBOX": None,
+        "ImapMail/imap.gmail.com/INBOX.msf": None,
+        "ImapMail/outlook.office365.com/INBOX": None,
+        "ImapMail/outlook.office365.com/INBOX.msf": None,
+        "ImapMail/outlook.office365.com/Drafts": None,
+        "ImapMail/outlook.office365.com/Drafts.msf": None,
+    })
+    return profile
+
+
+@pytest.fixture(scope="session")
+def default_config():
+    """Create a shared config for tests that only read it.
+
+    Shared across the session, so tests must not mutate it; use
+    dataclasses.replace() to derive variants.
+    """
+    return Config(
+        imap=ImapConfig(host="imap.example.com"),
+        websocket=WebSocketConfig(enabled=True, auth_token="test-token"),
+        thunderbird=ThunderbirdConfig(),
+        database=DatabaseConfig(path="test.db", categories_file="categories.txt"),
+    )
+
+
 @pytest.fixture
 def sample_config(temp_dir):
     """Create a sample configuration for testing."""
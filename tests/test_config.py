@@ -7,6 +7,7 @@ from mailmap.config import (
     ImapConfig,
     OllamaConfig,
     ThunderbirdConfig,
+    WebSocketConfig,
     load_config,
 )
 
@@ -57,6 +58,17 @@ class TestThunderbirdConfig:
         assert config.import_limit is None
 
 
+class TestWebSocketConfig:
+    def test_url(self):
+        config = WebSocketConfig(host="127.0.0.1", port=9753)
+        assert config.url == "ws://127.0.0.1:9753"
+
+    def test_url_follows_port_override(self):
+        config = WebSocketConfig()
+        config.port = 9999
+        assert config.url == "ws://127.0.0.1:9999"
+
+
 class TestLoadConfig:
     def test_load_config(self, sample_config_toml, monkeypatch):
         # Clear username env var so it doesn't override config file value
@@ -26,6 +26,19 @@ class TestDatabase:
             assert db._conn is not None
         assert db._conn is None
 
+    def test_in_memory(self, temp_dir, monkeypatch):
+        monkeypatch.chdir(temp_dir)
+        with Database(":memory:") as db:
+            db.insert_email(Email(
+                message_id="<mem@example.com>",
+                folder_id="INBOX",
+                subject="In memory",
+                from_addr="a@example.com",
+                mbox_path="/tmp/mbox",
+            ))
+            assert db.get_email("<mem@example.com>") is not None
+        assert list(temp_dir.iterdir()) == []
+
 
 class TestEmailOperations:
     def test_insert_and_get_email(self, test_db):
@@ -93,23 +93,23 @@ class TestThunderbirdSource:
             await source.connect()
 
     @pytest.mark.asyncio
-    async def test_context_manager(self, mock_thunderbird_profile):
-        source = ThunderbirdSource(profile_path=mock_thunderbird_profile)
+    async def test_context_manager(self, readonly_thunderbird_profile):
+        source = ThunderbirdSource(profile_path=readonly_thunderbird_profile)
         async with source as s:
             assert s._reader is not None
         assert s._reader is None
 
     @pytest.mark.asyncio
-    async def test_list_folders(self, mock_thunderbird_profile):
-        source = ThunderbirdSource(profile_path=mock_thunderbird_profile)
+    async def test_list_folders(self, readonly_thunderbird_profile):
+        source = ThunderbirdSource(profile_path=readonly_thunderbird_profile)
         async with source:
             folders = await source.list_folders()
             # Should be qualified (server:folder) format
             assert any("INBOX" in f for f in folders)
 
     @pytest.mark.asyncio
-    async def test_read_emails(self, mock_thunderbird_profile):
-        source = ThunderbirdSource(profile_path=mock_thunderbird_profile)
+    async def test_read_emails(self, readonly_thunderbird_profile):
+        source = ThunderbirdSource(profile_path=readonly_thunderbird_profile)
         async with source:
             folders = await source.list_folders()
             inbox = [f for f in folders if "INBOX" in f][0]
@@ -123,8 +123,8 @@ class TestThunderbirdSource:
             assert all(e.source_type == "thunderbird" for e in emails)
 
     @pytest.mark.asyncio
-    async def test_read_emails_with_limit(self, mock_thunderbird_profile):
-        source = ThunderbirdSource(profile_path=mock_thunderbird_profile)
+    async def test_read_emails_with_limit(self, readonly_thunderbird_profile):
+        source = ThunderbirdSource(profile_path=readonly_thunderbird_profile)
         async with source:
             folders = await source.list_folders()
             inbox = [f for f in folders if "INBOX" in f][0]
@@ -144,10 +144,11 @@ class TestImapSource:
 
 
 class TestSelectSource:
-    def test_select_thunderbird_when_available(self, mock_thunderbird_profile):
+    def test_select_thunderbird_when_available(self, temp_dir):
+        # Selection only checks that the profile directory exists
         config = Config(
             imap=ImapConfig(host="imap.example.com"),
-            thunderbird=ThunderbirdConfig(profile_path=str(mock_thunderbird_profile)),
+            thunderbird=ThunderbirdConfig(profile_path=str(temp_dir)),
         )
         source = select_source(config)
         assert isinstance(source, ThunderbirdSource)
@@ -1,11 +1,14 @@
 """Tests for spam rule parser and checker."""
 
+from unittest.mock import patch
+
 import pytest
 
 from mailmap.spam import (
     Operator,
     RuleParseError,
     check_rule,
+    compile_rules,
     is_spam,
     parse_rule,
     parse_rules,
@@ -277,6 +280,38 @@ class TestIsSpam:
         assert result is False
 
 
+class TestCompileRules:
+    """Tests for compile_rules memoized checker."""
+
+    def test_matches_like_is_spam(self):
+        """Test that compiled checker agrees with is_spam."""
+        rules = parse_rules([
+            "X-Score >= 5",
+            "X-Spam-Flag == YES",
+        ])
+        check = compile_rules(rules)
+        headers = {"x-score": "1", "X-Spam-Flag": "YES", "Subject": "Hi"}
+        assert check(headers) == is_spam(headers, rules)
+        assert check({"X-Score": "1"}) == (False, None)
+
+    def test_caches_on_relevant_headers(self):
+        """Test that irrelevant headers do not defeat the cache."""
+        rules = parse_rules(["X-Spam-Flag == YES"])
+        check = compile_rules(rules)
+        with patch("mailmap.spam.is_spam", wraps=is_spam) as evaluate:
+            assert check({"X-Spam-Flag": "YES", "Subject": "One"})[0] is True
+            assert check({"X-Spam-Flag": "YES", "Subject": "Two"})[0] is True
+            assert evaluate.call_count == 1
+
+            assert check({"X-Spam-Flag": "NO", "Subject": "Three"})[0] is False
+            assert evaluate.call_count == 2
+
+    def test_empty_rules(self):
+        """Test that compiled empty rules returns not spam."""
+        check = compile_rules([])
+        assert check({"X-Score": "10"}) == (False, None)
+
+
 class TestParseRules:
     """Tests for parse_rules function."""
 
@@ -1,5 +1,6 @@
 """Tests for sync and transfer commands."""
 
+import shutil
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
@@ -9,6 +10,8 @@ from mailmap.commands.utils import sync_transfers
 from mailmap.config import Config, DatabaseConfig, ImapConfig
 from mailmap.database import Database, Email
 
+_TS = datetime(2024, 1, 1)
+
 
 @pytest.fixture
 def mock_config(tmp_path):
@@ -30,10 +33,11 @@ def mock_config(tmp_path):
     )
 
 
-@pytest.fixture
-def db_with_emails(tmp_path):
-    """Create a database with test emails."""
-    db = Database(str(tmp_path / "test.db"))
+@pytest.fixture(scope="session")
+def _db_template(tmp_path_factory):
+    """Build the populated test database once per session."""
+    path = tmp_path_factory.mktemp("sync_template") / "test.db"
+    db = Database(str(path))
     db.connect()
     db.init_schema()
 
@@ -47,7 +51,7 @@ def db_with_emails(tmp_path):
             mbox_path="",
             classification="Work",
             confidence=0.9,
-            processed_at=datetime.now(),
+            processed_at=_TS,
         ),
         Email(
             message_id="<msg2@example.com>",
@@ -57,7 +61,7 @@ def db_with_emails(tmp_path):
             mbox_path="",
             classification="Personal",
             confidence=0.85,
-            processed_at=datetime.now(),
+            processed_at=_TS,
         ),
         Email(
             message_id="<msg3@example.com>",
@@ -67,7 +71,7 @@ def db_with_emails(tmp_path):
             mbox_path="",
             classification="Work",
             confidence=0.95,
-            processed_at=datetime.now(),
+            processed_at=_TS,
         ),
     ]
 
@@ -78,6 +82,13 @@ def db_with_emails(tmp_path):
     db.mark_as_transferred("<msg1@example.com>")
 
     db.close()
+    return path
+
+
+@pytest.fixture
+def db_with_emails(tmp_path, _db_template):
+    """Create a database with test emails."""
+    shutil.copy(_db_template, tmp_path / "test.db")
     return Database(str(tmp_path / "test.db"))
 
 
@@ -1,223 +1,189 @@
 """Tests for email target abstractions."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import pytest_asyncio
 
-from mailmap.config import Config, DatabaseConfig, ImapConfig, ThunderbirdConfig, WebSocketConfig
 from mailmap.targets import (
+    EmailTarget,
     ImapTarget,
+    WebSocketRequiredError,
     WebSocketTarget,
     select_target,
 )
-from mailmap.targets.base import EmailTarget as EmailTargetProtocol
+
+# EmailTarget protocol surface; mypy also checks conformance via select_target
+_PROTOCOL_MEMBERS = (
+    *(name for name in vars(EmailTarget) if not name.startswith("_")),
+    "__aenter__",
+    "__aexit__",
+)
+
+# Canned send_request responses; only .ok/.result are read
+_ACCOUNTS_OK = SimpleNamespace(ok=True, result={"accounts": [{"id": "acc1", "type": "none"}]})
+_CREATED_OK = SimpleNamespace(ok=True, result={"created": True})
+_EMPTY_OK = SimpleNamespace(ok=True, result={})
+
+_RAW_EMAIL = b"From: test@example.com\r\nSubject: Test\r\n\r\nBody"
+_RAW_MARKER = b"raw email"
+
+
+def _async_returns(*values):
+    """Build a coroutine function returning each of values in turn."""
+    it = iter(values)
+
+    async def _f(*args, **kwargs):
+        return next(it)
+
+    return _f
 
 
 @pytest.fixture
-def mock_config():
-    """Create a mock config for WebSocketTarget tests."""
-    return Config(
-        imap=ImapConfig(host="imap.example.com"),
-        websocket=WebSocketConfig(enabled=True, auth_token="test-token"),
-        thunderbird=ThunderbirdConfig(),
-        database=DatabaseConfig(path="test.db", categories_file="categories.txt"),
-    )
+def mock_ws_server():
+    """Create a mock WebSocket server as returned by start_websocket_and_wait."""
+    server = MagicMock()
+    server.stop = AsyncMock()
+    return server
+
+
+@pytest.fixture
+def mock_start(monkeypatch):
+    """Replace start_websocket_and_wait with an AsyncMock."""
+    start = AsyncMock()
+    monkeypatch.setattr("mailmap.websocket_server.start_websocket_and_wait", start)
+    return start
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def connected_target(default_config, mock_ws_server, mock_start):
+    """Yield a WebSocketTarget already connected to the Local Folders account."""
+    mock_ws_server.send_request = _async_returns(_ACCOUNTS_OK)
+    mock_start.return_value = (mock_ws_server, MagicMock())
+    target = WebSocketTarget(default_config, "local", 9753)
+    await target.connect()
+    yield target
+    await target.disconnect()
 
 
 class TestWebSocketTarget:
-    def test_target_type(self, mock_config):
-        target = WebSocketTarget(mock_config, "local", 9753)
+    def test_target_type(self, default_config):
+        target = WebSocketTarget(default_config, "local", 9753)
         assert target.target_type == "websocket"
 
-    @pytest.mark.asyncio
-    async def test_connect_raises_on_timeout(self, mock_config):
+
+class TestWebSocketTargetConnection:
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+    @pytest.mark.connect_cycle
+    async def test_connect_raises_on_timeout(self, default_config, mock_start):
         """Test that connect raises when no extension connects."""
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = None  # Timeout
+        mock_start.return_value = None  # Timeout
 
-            target = WebSocketTarget(mock_config, "local", 9753)
-            with pytest.raises(RuntimeError, match="Timeout waiting for Thunderbird extension"):
-                await target.connect()
+        target = WebSocketTarget(default_config, "local", 9753)
+        with pytest.raises(RuntimeError, match="Timeout waiting for Thunderbird extension"):
+            await target.connect()
 
-    @pytest.mark.asyncio
-    async def test_connect_resolves_local_account(self, mock_config):
+    @pytest.mark.connect_cycle
+    async def test_connect_resolves_local_account(self, default_config, mock_ws_server, mock_start):
         """Test that connect resolves 'local' to Local Folders account ID."""
-        mock_ws_server = MagicMock()
-        mock_ws_server.send_request = AsyncMock(return_value=MagicMock(
+        mock_ws_server.send_request = _async_returns(SimpleNamespace(
             ok=True,
             result={"accounts": [{"id": "account1", "type": "none"}]}
         ))
-        mock_ws_server.stop = AsyncMock()
         mock_task = MagicMock()
 
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = (mock_ws_server, mock_task)
+        mock_start.return_value = (mock_ws_server, mock_task)
 
-            target = WebSocketTarget(mock_config, "local", 9753)
-            await target.connect()
+        target = WebSocketTarget(default_config, "local", 9753)
+        await target.connect()
 
-            assert target._account_id == "account1"
+        assert target._account_id == "account1"
 
-            await target.disconnect()
+        await target.disconnect()
 
-    @pytest.mark.asyncio
-    async def test_operations_fail_when_not_connected(self, mock_config):
-        target = WebSocketTarget(mock_config, "local", 9753)
+    async def test_operations_fail_when_not_connected(self, default_config):
+        target = WebSocketTarget(default_config, "local", 9753)
         # Not connected
 
         with pytest.raises(RuntimeError, match="Target not connected"):
             await target.create_folder("Test")
 
-    @pytest.mark.asyncio
-    async def test_create_folder(self, mock_config):
-        """Test creating a folder via WebSocket."""
-        mock_ws_server = MagicMock()
-        mock_ws_server.send_request = AsyncMock(side_effect=[
-            MagicMock(ok=True, result={"accounts": [{"id": "acc1", "type": "none"}]}),
-            MagicMock(ok=True, result={"created": True}),
-        ])
-        mock_ws_server.stop = AsyncMock()
-        mock_task = MagicMock()
-
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = (mock_ws_server, mock_task)
-
-            async with WebSocketTarget(mock_config, "local", 9753) as target:
-                result = await target.create_folder("TestFolder")
-                assert result is True
-
-    @pytest.mark.asyncio
-    async def test_copy_email(self, mock_config):
-        """Test copying an email via WebSocket."""
-        mock_ws_server = MagicMock()
-        mock_ws_server.send_request = AsyncMock(side_effect=[
-            MagicMock(ok=True, result={"accounts": [{"id": "acc1", "type": "none"}]}),
-            MagicMock(ok=True, result={}),
-        ])
-        mock_ws_server.stop = AsyncMock()
-        mock_task = MagicMock()
-
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = (mock_ws_server, mock_task)
+    @pytest.mark.connect_cycle
+    @pytest.mark.parametrize(
+        "method,args,kwargs,response",
+        [
+            ("create_folder", ("TestFolder",), {}, _CREATED_OK),
+            ("copy_email", ("<msg@example.com>", "Inbox"), {}, _EMPTY_OK),
+            ("move_email", ("<msg@example.com>", "Archive"), {}, _EMPTY_OK),
+            # raw_bytes should be accepted but ignored
+            ("copy_email", ("<msg@example.com>", "Inbox"), {"raw_bytes": _RAW_MARKER}, _EMPTY_OK),
+            ("move_email", ("<msg@example.com>", "Archive"), {"raw_bytes": _RAW_MARKER}, _EMPTY_OK),
+        ],
+        ids=["create_folder", "copy_email", "move_email", "copy_raw_bytes", "move_raw_bytes"],
+    )
+    async def test_operation_succeeds(
+        self, connected_target, mock_ws_server, method, args, kwargs, response
+    ):
+        """Test folder and message operations via WebSocket."""
+        mock_ws_server.send_request = _async_returns(response)
 
-            async with WebSocketTarget(mock_config, "local", 9753) as target:
-                result = await target.copy_email("<msg@example.com>", "Inbox")
-                assert result is True
+        result = await getattr(connected_target, method)(*args, **kwargs)
+        assert result is True
 
-    @pytest.mark.asyncio
-    async def test_move_email(self, mock_config):
-        """Test moving an email via WebSocket."""
-        mock_ws_server = MagicMock()
-        mock_ws_server.send_request = AsyncMock(side_effect=[
-            MagicMock(ok=True, result={"accounts": [{"id": "acc1", "type": "none"}]}),
-            MagicMock(ok=True, result={}),
-        ])
-        mock_ws_server.stop = AsyncMock()
-        mock_task = MagicMock()
+    @pytest.mark.connect_cycle
+    async def test_context_manager(self, default_config, mock_ws_server, mock_start):
+        """Test that async with connects on entry and disconnects on exit."""
+        mock_ws_server.send_request = _async_returns(_ACCOUNTS_OK)
+        mock_start.return_value = (mock_ws_server, MagicMock())
 
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = (mock_ws_server, mock_task)
+        async with WebSocketTarget(default_config, "local", 9753) as target:
+            assert target._account_id == "acc1"
 
-            async with WebSocketTarget(mock_config, "local", 9753) as target:
-                result = await target.move_email("<msg@example.com>", "Archive")
-                assert result is True
+        assert target._account_id is None
+        mock_ws_server.stop.assert_awaited_once()
 
 
 class TestImapTarget:
-    def test_target_type(self):
-        config = ImapConfig(host="imap.example.com")
-        target = ImapTarget(config)
+    def test_target_type(self, default_config):
+        target = ImapTarget(default_config.imap)
         assert target.target_type == "imap"
 
 
 class TestSelectTarget:
-    def test_select_imap_target_explicitly(self):
-        """Test that target_account='imap' selects ImapTarget."""
-        config = Config(
-            imap=ImapConfig(host="imap.example.com"),
-        )
-        target = select_target(config, "imap")
-        assert isinstance(target, ImapTarget)
-
-    def test_select_websocket_for_local_with_port(self, mock_config):
-        """Test that 'local' with websocket_port selects WebSocketTarget."""
-        target = select_target(mock_config, "local", websocket_port=9753)
-        assert isinstance(target, WebSocketTarget)
-
-    def test_raises_for_local_without_websocket_port(self):
-        """Test that 'local' without websocket_port raises an error."""
-        config = Config(
-            imap=ImapConfig(host="imap.example.com"),
-            websocket=WebSocketConfig(enabled=True),
-        )
-        with pytest.raises(ValueError, match="requires --websocket"):
-            select_target(config, "local")
-
-    def test_falls_back_to_imap_without_websocket_port(self):
-        """Test that server names fall back to IMAP when no websocket_port."""
-        config = Config(
-            imap=ImapConfig(host="imap.example.com"),
-            websocket=WebSocketConfig(enabled=True),
-        )
-        target = select_target(config, "outlook.office365.com")
-        assert isinstance(target, ImapTarget)
-
-    def test_select_websocket_for_server_with_port(self, mock_config):
-        """Test that server name with websocket_port selects WebSocketTarget."""
-        target = select_target(mock_config, "imap.example.com", websocket_port=9753)
-        assert isinstance(target, WebSocketTarget)
-
-
-class TestWebSocketTargetWithRawBytes:
-    """Test that WebSocketTarget accepts but ignores raw_bytes."""
-
-    @pytest.mark.asyncio
-    async def test_copy_email_with_raw_bytes(self, mock_config):
-        """Test copy_email accepts raw_bytes parameter."""
-        mock_ws_server = MagicMock()
-        mock_ws_server.send_request = AsyncMock(side_effect=[
-            MagicMock(ok=True, result={"accounts": [{"id": "acc1", "type": "none"}]}),
-            MagicMock(ok=True, result={}),
-        ])
-        mock_ws_server.stop = AsyncMock()
-        mock_task = MagicMock()
-
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = (mock_ws_server, mock_task)
-
-            async with WebSocketTarget(mock_config, "local", 9753) as target:
-                # raw_bytes should be accepted but ignored
-                result = await target.copy_email("<msg@example.com>", "Inbox", raw_bytes=b"raw email")
-                assert result is True
-
-    @pytest.mark.asyncio
-    async def test_move_email_with_raw_bytes(self, mock_config):
-        """Test move_email accepts raw_bytes parameter."""
-        mock_ws_server = MagicMock()
-        mock_ws_server.send_request = AsyncMock(side_effect=[
-            MagicMock(ok=True, result={"accounts": [{"id": "acc1", "type": "none"}]}),
-            MagicMock(ok=True, result={}),
-        ])
-        mock_ws_server.stop = AsyncMock()
-        mock_task = MagicMock()
-
-        with patch("mailmap.websocket_server.start_websocket_and_wait", new_callable=AsyncMock) as mock_start:
-            mock_start.return_value = (mock_ws_server, mock_task)
+    pytestmark = pytest.mark.fast
+
+    @pytest.mark.parametrize(
+        "target_account,websocket_port,expected",
+        [
+            ("imap", None, ImapTarget),
+            ("imap", 9753, ImapTarget),
+            ("local", 9753, WebSocketTarget),
+            ("imap.example.com", 9753, WebSocketTarget),
+            ("outlook.office365.com", None, ImapTarget),
+        ],
+        ids=["imap", "imap_ignores_port", "local_with_port", "server_with_port", "server_fallback"],
+    )
+    def test_selects_target(self, default_config, target_account, websocket_port, expected):
+        """Test target selection by account name and websocket_port."""
+        target = select_target(default_config, target_account, websocket_port=websocket_port)
+        assert isinstance(target, expected)
 
-            async with WebSocketTarget(mock_config, "local", 9753) as target:
-                # raw_bytes should be accepted but ignored
-                result = await target.move_email("<msg@example.com>", "Archive", raw_bytes=b"raw email")
-                assert result is True
+    def test_raises_for_local_without_websocket_port(self, default_config):
+        """Test that 'local' without websocket_port raises an error."""
+        with pytest.raises(WebSocketRequiredError):
+            select_target(default_config, "local")
 
 
 class TestImapTargetWithRawBytes:
     """Test ImapTarget copy/move with raw_bytes for cross-server transfers."""
 
-    @pytest.mark.asyncio
-    async def test_copy_email_with_raw_bytes_uploads_directly(self):
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+    async def test_copy_email_with_raw_bytes_uploads_directly(self, default_config):
         """Test that copy_email uploads raw_bytes directly without searching."""
-        config = ImapConfig(host="imap.example.com")
-        target = ImapTarget(config)
+        target = ImapTarget(default_config.imap)
 
         # Mock the mailbox
         mock_mailbox = MagicMock()
@@ -225,18 +191,16 @@ class TestImapTargetWithRawBytes:
         mock_mailbox.append_email = MagicMock()
         target._mailbox = mock_mailbox
 
-        raw_content = b"From: test@example.com\r\nSubject: Test\r\n\r\nBody"
-        result = await target.copy_email("<msg@example.com>", "Inbox", raw_bytes=raw_content)
+        result = await target.copy_email("<msg@example.com>", "Inbox", raw_bytes=_RAW_EMAIL)
 
         assert result is True
         mock_mailbox.ensure_folder.assert_called_once_with("Inbox")
-        mock_mailbox.append_email.assert_called_once_with("Inbox", raw_content)
+        mock_mailbox.append_email.assert_called_once_with("Inbox", _RAW_EMAIL)
+        assert mock_mailbox.append_email.call_args.args[1] is _RAW_EMAIL
 
-    @pytest.mark.asyncio
-    async def test_move_email_with_raw_bytes_uploads_directly(self):
+    async def test_move_email_with_raw_bytes_uploads_directly(self, default_config):
         """Test that move_email uploads raw_bytes directly without searching."""
-        config = ImapConfig(host="imap.example.com")
-        target = ImapTarget(config)
+        target = ImapTarget(default_config.imap)
 
         # Mock the mailbox
         mock_mailbox = MagicMock()
@@ -244,22 +208,22 @@ class TestImapTargetWithRawBytes:
         mock_mailbox.append_email = MagicMock()
         target._mailbox = mock_mailbox
 
-        raw_content = b"From: test@example.com\r\nSubject: Test\r\n\r\nBody"
-        result = await target.move_email("<msg@example.com>", "Archive", raw_bytes=raw_content)
+        result = await target.move_email("<msg@example.com>", "Archive", raw_bytes=_RAW_EMAIL)
 
         assert result is True
         mock_mailbox.ensure_folder.assert_called_once_with("Archive")
-        mock_mailbox.append_email.assert_called_once_with("Archive", raw_content)
+        mock_mailbox.append_email.assert_called_once_with("Archive", _RAW_EMAIL)
+        assert mock_mailbox.append_email.call_args.args[1] is _RAW_EMAIL
 
 
 class TestImapTargetDuplicatePrevention:
     """Test that ImapTarget prevents duplicate copies."""
 
-    @pytest.mark.asyncio
-    async def test_copy_email_skips_if_already_in_target_folder(self):
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+    async def test_copy_email_skips_if_already_in_target_folder(self, default_config):
         """Test that copy_email returns True without appending if email is already in target."""
-        config = ImapConfig(host="imap.example.com")
-        target = ImapTarget(config)
+        target = ImapTarget(default_config.imap)
 
         # Mock the mailbox
         mock_mailbox = MagicMock()
@@ -281,11 +245,9 @@ class TestImapTargetDuplicatePrevention:
         # append_email should NOT be called since email is already in target
         mock_mailbox.append_email.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_copy_email_copies_if_in_different_folder(self):
+    async def test_copy_email_copies_if_in_different_folder(self, default_config):
         """Test that copy_email copies when email is in a different folder."""
-        config = ImapConfig(host="imap.example.com")
-        target = ImapTarget(config)
+        target = ImapTarget(default_config.imap)
 
         # Mock the mailbox
         mock_mailbox = MagicMock()
@@ -309,11 +271,8 @@ class TestImapTargetDuplicatePrevention:
 
 
 class TestEmailTargetProtocol:
-    def test_websocket_target_implements_protocol(self, mock_config):
-        target = WebSocketTarget(mock_config, "local", 9753)
-        assert isinstance(target, EmailTargetProtocol)
-
-    def test_imap_target_implements_protocol(self):
-        config = ImapConfig(host="imap.example.com")
-        target = ImapTarget(config)
-        assert isinstance(target, EmailTargetProtocol)
+    pytestmark = pytest.mark.fast
+
+    @pytest.mark.parametrize("target_cls", [ImapTarget, WebSocketTarget])
+    def test_target_implements_protocol(self, target_cls):
+        assert all(hasattr(target_cls, member) for member in _PROTOCOL_MEMBERS)
@@ -1,6 +1,7 @@
 """Tests for Thunderbird module."""
 
-import mailbox
+import os
+from unittest.mock import patch
 
 import pytest
 
@@ -14,110 +15,9 @@ from mailmap.thunderbird import ThunderbirdReader
 
 
 @pytest.fixture
-def mock_thunderbird_profile(temp_dir):
-    """Create a mock Thunderbird profile structure."""
-    profile = temp_dir / "mock.default"
-    profile.mkdir()
-
-    # Create ImapMail directory with a mock server
-    imap_mail = profile / "ImapMail" / "imap.example.com"
-    imap_mail.mkdir(parents=True)
-
-    # Create mock mbox files
-    inbox_mbox = imap_mail / "INBOX"
-    sent_mbox = imap_mail / "Sent"
-
-    # Create a simple mbox with test messages
-    mbox = mailbox.mbox(inbox_mbox)
-    msg1 = mailbox.mboxMessage()
-    msg1["Message-ID"] = "<test1@example.com>"
-    msg1["From"] = "sender@example.com"
-    msg1["Subject"] = "Test Subject 1"
-    msg1.set_payload("This is the body of test email 1.")
-    mbox.add(msg1)
-
-    msg2 = mailbox.mboxMessage()
-    msg2["Message-ID"] = "<test2@example.com>"
-    msg2["From"] = "another@example.com"
-    msg2["Subject"] = "Test Subject 2"
-    msg2.set_payload("This is the body of test email 2.")
-    mbox.add(msg2)
-    mbox.close()
-
-    # Create empty Sent mbox
-    sent_mbox.touch()
-
-    # Create .msf files (index files that Thunderbird creates)
-    (imap_mail / "INBOX.msf").touch()
-    (imap_mail / "Sent.msf").touch()
-
-    # Create Local Folders directory
-    local_folders = profile / "Mail" / "Local Folders"
-    local_folders.mkdir(parents=True)
-
-    # Create prefs.js with account mappings
-    prefs_js = profile / "prefs.js"
-    prefs_js.write_text(f'''// Mozilla User Preferences
-user_pref("mail.account.account1.server", "server1");
-user_pref("mail.account.account2.server", "server2");
-user_pref("mail.accountmanager.accounts", "account1,account2");
-user_pref("mail.accountmanager.localfoldersserver", "server2");
-user_pref("mail.server.server1.directory", "{imap_mail}");
-user_pref("mail.server.server1.hostname", "imap.example.com");
-user_pref("mail.server.server1.type", "imap");
-user_pref("mail.server.server2.directory", "{local_folders}");
-user_pref("mail.server.server2.type", "none");
-''')
-
-    return profile
-
-
-@pytest.fixture
-def mock_profile_with_subfolders(temp_dir):
-    """Create a mock profile with nested subfolders."""
-    profile = temp_dir / "nested.default"
-    profile.mkdir()
-
-    imap_mail = profile / "ImapMail" / "imap.test.com"
-    imap_mail.mkdir(parents=True)
-
-    # Create INBOX
-    inbox = imap_mail / "INBOX"
-    inbox.touch()
-    (imap_mail / "INBOX.msf").touch()
-
-    # Create subfolder using .sbd convention
-    inbox_sbd = imap_mail / "INBOX.sbd"
-    inbox_sbd.mkdir()
-
-    work = inbox_sbd / "Work"
-    work.touch()
-    (inbox_sbd / "Work.msf").touch()
-
-    return profile
-
-
-@pytest.fixture
-def mock_profile_multiple_accounts(temp_dir):
-    """Create a mock profile with multiple IMAP accounts having the same folder."""
-    profile = temp_dir / "multi.default"
-    profile.mkdir()
-
-    # First account
-    imap1 = profile / "ImapMail" / "imap.gmail.com"
-    imap1.mkdir(parents=True)
-    (imap1 / "INBOX").touch()
-    (imap1 / "INBOX.msf").touch()
-
-    # Second account
-    imap2 = profile / "ImapMail" / "outlook.office365.com"
-    imap2.mkdir(parents=True)
-    (imap2 / "INBOX").touch()
-    (imap2 / "INBOX.msf").touch()
-    (imap2 / "Drafts").touch()
-    (imap2 / "Drafts.msf").touch()
-
-    return profile
+def reader(readonly_thunderbird_profile):
+    """ThunderbirdReader over the shared read-only mock profile."""
+    return ThunderbirdReader(profile_path=readonly_thunderbird_profile)
 
 
 class TestThunderbirdEmail:
@@ -137,8 +37,8 @@ class TestThunderbirdEmail:
 
 
 class TestFindImapMailDirs:
-    def test_finds_imap_dirs(self, mock_thunderbird_profile):
-        imap_dirs = find_imap_mail_dirs(mock_thunderbird_profile)
+    def test_finds_imap_dirs(self, readonly_thunderbird_profile):
+        imap_dirs = find_imap_mail_dirs(readonly_thunderbird_profile)
         assert len(imap_dirs) == 1
         assert imap_dirs[0].name == "imap.example.com"
 
@@ -150,8 +50,8 @@ class TestFindImapMailDirs:
 
 
 class TestListMboxFiles:
-    def test_lists_mbox_files(self, mock_thunderbird_profile):
-        imap_dir = mock_thunderbird_profile / "ImapMail" / "imap.example.com"
+    def test_lists_mbox_files(self, readonly_thunderbird_profile):
+        imap_dir = readonly_thunderbird_profile / "ImapMail" / "imap.example.com"
         mbox_files = list_mbox_files(imap_dir)
 
         folder_names = {name for name, _ in mbox_files}
@@ -166,10 +66,48 @@ class TestListMboxFiles:
         assert "INBOX" in folder_names
         assert "INBOX/Work" in folder_names
 
+    def test_one_scandir_per_directory(self, mock_profile_with_subfolders):
+        imap_dir = mock_profile_with_subfolders / "ImapMail" / "imap.test.com"
+
+        with patch("mailmap.mbox.os.scandir", wraps=os.scandir) as scandir:
+            list_mbox_files(imap_dir)
+
+        # imap.test.com and INBOX.sbd
+        assert scandir.call_count == 2
+
+    def test_sees_new_subfolder_in_sbd(self, temp_dir):
+        (temp_dir / "INBOX").write_bytes(b"From a@example.com\n")
+        sbd = temp_dir / "INBOX.sbd"
+        sbd.mkdir()
+        assert [name for name, _ in list_mbox_files(temp_dir)] == ["INBOX"]
+
+        (sbd / "Work").write_bytes(b"From a@example.com\n")
+        assert {name for name, _ in list_mbox_files(temp_dir)} == {"INBOX", "INBOX/Work"}
+
+    def test_sees_empty_mbox_gaining_content(self, temp_dir):
+        inbox = temp_dir / "INBOX"
+        inbox.touch()
+        assert list_mbox_files(temp_dir) == []
+
+        inbox.write_bytes(b"From a@example.com\n")
+        assert [name for name, _ in list_mbox_files(temp_dir)] == ["INBOX"]
+
+    def test_follows_symlinked_mbox(self, temp_dir):
+        target = temp_dir / "elsewhere"
+        target.write_bytes(b"From a@example.com\n")
+        mail_dir = temp_dir / "mail"
+        mail_dir.mkdir()
+        (mail_dir / "INBOX").symlink_to(target)
+
+        assert [name for name, _ in list_mbox_files(mail_dir)] == ["INBOX"]
+
+    def test_missing_dir(self, temp_dir):
+        assert list_mbox_files(temp_dir / "missing") == []
+
 
 class TestReadMbox:
-    def test_reads_emails(self, mock_thunderbird_profile):
-        mbox_path = mock_thunderbird_profile / "ImapMail" / "imap.example.com" / "INBOX"
+    def test_reads_emails(self, readonly_thunderbird_profile):
+        mbox_path = readonly_thunderbird_profile / "ImapMail" / "imap.example.com" / "INBOX"
         emails = list(read_mbox(mbox_path, "INBOX"))
 
         assert len(emails) == 2
@@ -178,113 +116,134 @@ class TestReadMbox:
         assert "Test Subject 1" in subjects
         assert "Test Subject 2" in subjects
 
-    def test_respects_limit(self, mock_thunderbird_profile):
-        mbox_path = mock_thunderbird_profile / "ImapMail" / "imap.example.com" / "INBOX"
+    def test_respects_limit(self, readonly_thunderbird_profile):
+        mbox_path = readonly_thunderbird_profile / "ImapMail" / "imap.example.com" / "INBOX"
         emails = list(read_mbox(mbox_path, "INBOX", limit=1))
 
         assert len(emails) == 1
 
-    def test_empty_mbox(self, mock_thunderbird_profile):
-        mbox_path = mock_thunderbird_profile / "ImapMail" / "imap.example.com" / "Sent"
+    def test_reads_emails_from_raw_bytes(self, temp_dir):
+        """Test an mbox written as plain bytes needs no lock or index files."""
+        mbox_path = temp_dir / "INBOX"
+        mbox_path.write_bytes(
+            b"From sender@example.com Mon Jan 01 00:00:00 2024\n"
+            b"Message-ID: <raw1@example.com>\n"
+            b"Subject: Raw 1\n"
+            b"\n"
+            b"First body\n"
+            b"\n"
+            b"From sender@example.com Mon Jan 01 00:00:00 2024\n"
+            b"Message-ID: <raw2@example.com>\n"
+            b"Subject: Raw 2\n"
+            b"\n"
+            b"Second body\n"
+        )
+
+        emails = list(read_mbox(mbox_path, "INBOX"))
+
+        assert [e.message_id for e in emails] == ["<raw1@example.com>", "<raw2@example.com>"]
+        assert [p.name for p in temp_dir.iterdir()] == ["INBOX"]
+
+    def test_empty_mbox(self, readonly_thunderbird_profile):
+        mbox_path = readonly_thunderbird_profile / "ImapMail" / "imap.example.com" / "Sent"
         emails = list(read_mbox(mbox_path, "Sent"))
 
         assert len(emails) == 0
 
 
 class TestThunderbirdReader:
-    def test_init_with_explicit_path(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
-        assert reader.profile_path == mock_thunderbird_profile
+    def test_init_with_explicit_path(self, temp_dir):
+        reader = ThunderbirdReader(profile_path=temp_dir)
+        assert reader.profile_path == temp_dir
 
     def test_init_invalid_path(self, temp_dir):
         with pytest.raises(ValueError, match="Could not find Thunderbird profile"):
             ThunderbirdReader(profile_path=temp_dir / "nonexistent")
 
-    def test_list_servers(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_list_servers(self, reader):
         servers = reader.list_servers()
 
         assert "imap.example.com" in servers
 
-    def test_list_folders(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_list_folders(self, reader):
         folders = reader.list_folders()
 
         assert "INBOX" in folders
         assert "Sent" in folders
 
-    def test_read_folder(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_list_folders_in_writable_copy(self, mock_thunderbird_profile, reader):
+        """Test folders added to a private profile copy don't leak into the template."""
+        imap_dir = mock_thunderbird_profile / "ImapMail" / "imap.example.com"
+        (imap_dir / "Archive").write_bytes(b"From a@example.com Mon Jan  1 00:00:00 2024\n\n")
+
+        copy_reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+
+        assert "Archive" in copy_reader.list_folders()
+        assert "Archive" not in reader.list_folders()
+
+    def test_read_folder(self, reader):
         emails = list(reader.read_folder("INBOX"))
 
         assert len(emails) == 2
         assert all(isinstance(e, ThunderbirdEmail) for e in emails)
 
-    def test_read_folder_with_server_prefix(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_read_folder_with_server_prefix(self, reader):
         emails = list(reader.read_folder("imap.example.com:INBOX"))
 
         assert len(emails) == 2
 
-    def test_read_folder_with_limit(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_read_folder_with_limit(self, reader):
         emails = list(reader.read_folder("INBOX", limit=1))
 
         assert len(emails) == 1
 
-    def test_get_sample_emails(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_get_sample_emails(self, reader):
         samples = reader.get_sample_emails("INBOX", count=5)
 
         assert len(samples) == 2  # Only 2 emails in mock
         assert all(isinstance(e, ThunderbirdEmail) for e in samples)
 
-    def test_resolve_folder(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_resolve_folder(self, reader):
         server, folder = reader.resolve_folder("INBOX")
 
         assert server == "imap.example.com"
         assert folder == "INBOX"
 
-    def test_resolve_folder_with_prefix(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_resolve_folder_with_prefix(self, reader):
         server, folder = reader.resolve_folder("imap.example.com:Sent")
 
         assert server == "imap.example.com"
         assert folder == "Sent"
 
-    def test_resolve_folder_not_found(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_resolve_folder_not_found(self, reader):
         with pytest.raises(ValueError, match="Folder 'Nonexistent' not found"):
             reader.resolve_folder("Nonexistent")
 
-    def test_list_folders_qualified(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_list_folders_qualified(self, reader):
         folders = reader.list_folders_qualified()
 
         assert "imap.example.com:INBOX" in folders
         assert "imap.example.com:Sent" in folders
 
-    def test_server_filter(self, mock_thunderbird_profile):
+    def test_server_filter(self, readonly_thunderbird_profile):
         reader = ThunderbirdReader(
-            profile_path=mock_thunderbird_profile,
+            profile_path=readonly_thunderbird_profile,
             server_filter="imap.example.com",
         )
         folders = reader.list_folders()
 
         assert "INBOX" in folders
 
-    def test_server_filter_no_match(self, mock_thunderbird_profile):
+    def test_server_filter_no_match(self, readonly_thunderbird_profile):
         reader = ThunderbirdReader(
-            profile_path=mock_thunderbird_profile,
+            profile_path=readonly_thunderbird_profile,
             server_filter="nonexistent.server.com",
         )
         folders = reader.list_folders()
 
         assert folders == []
 
-    def test_read_all(self, mock_thunderbird_profile):
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
+    def test_read_all(self, reader):
         emails = list(reader.read_all())
 
         # 2 emails in INBOX, 0 in Sent
@@ -322,29 +281,25 @@ class TestThunderbirdReader:
         assert "outlook.office365.com:Drafts" in folders
         assert len(folders) == 3
 
-    def test_resolve_server_to_account_id(self, mock_thunderbird_profile):
+    def test_resolve_server_to_account_id(self, reader):
         """Test resolving server hostname to account ID."""
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
         account_id = reader.resolve_server_to_account_id("imap.example.com")
 
         assert account_id == "account1"
 
-    def test_resolve_server_to_account_id_local(self, mock_thunderbird_profile):
+    def test_resolve_server_to_account_id_local(self, reader):
         """Test resolving 'local' to Local Folders account ID."""
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
         account_id = reader.resolve_server_to_account_id("local")
 
         assert account_id == "account2"
 
-    def test_resolve_server_to_account_id_not_found(self, mock_thunderbird_profile):
+    def test_resolve_server_to_account_id_not_found(self, reader):
         """Test that unknown server raises ValueError."""
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
         with pytest.raises(ValueError, match="not found in Thunderbird profile"):
             reader.resolve_server_to_account_id("unknown.server.com")
 
-    def test_get_account_mapping(self, mock_thunderbird_profile):
+    def test_get_account_mapping(self, reader):
         """Test getting the server to account ID mapping."""
-        reader = ThunderbirdReader(profile_path=mock_thunderbird_profile)
         mapping = reader.get_account_mapping()
 
         assert "imap.example.com" in mapping
@@ -354,9 +309,9 @@ class TestThunderbirdReader:
 
 
 class TestParsePrefsJs:
-    def test_parse_prefs_js(self, mock_thunderbird_profile):
+    def test_parse_prefs_js(self, readonly_thunderbird_profile):
         """Test parsing prefs.js into a dictionary."""
-        prefs = parse_prefs_js(mock_thunderbird_profile)
+        prefs = parse_prefs_js(readonly_thunderbird_profile)
 
         assert prefs["mail.account.account1.server"] == "server1"
         assert prefs["mail.account.account2.server"] == "server2"
@@ -368,11 +323,45 @@ class TestParsePrefsJs:
         prefs = parse_prefs_js(temp_dir)
         assert prefs == {}
 
+    def test_parse_prefs_js_reparses_on_change(self, temp_dir):
+        """Test cached prefs are refreshed when prefs.js is replaced."""
+        prefs_path = temp_dir / "prefs.js"
+        prefs_path.write_text('user_pref("mail.server.server1.hostname", "old.example.com");\n')
+        mtime_ns = prefs_path.stat().st_mtime_ns
+        assert parse_prefs_js(temp_dir)["mail.server.server1.hostname"] == "old.example.com"
+
+        # Thunderbird writes a temp file and renames it over prefs.js; pin the
+        # mtime to simulate a rewrite within one coarse timestamp tick
+        new_path = temp_dir / "prefs-1.js"
+        new_path.write_text('user_pref("mail.server.server1.hostname", "new.example.com");\n')
+        os.utime(new_path, ns=(mtime_ns, mtime_ns))
+        os.replace(new_path, prefs_path)
+        assert parse_prefs_js(temp_dir)["mail.server.server1.hostname"] == "new.example.com"
+
+        # An in-place rewrite in the same tick is caught by the size change
+        prefs_path.write_text('user_pref("mail.server.server1.hostname", "newer.example.com");\n')
+        os.utime(prefs_path, ns=(mtime_ns, mtime_ns))
+        assert parse_prefs_js(temp_dir)["mail.server.server1.hostname"] == "newer.example.com"
+
+    def test_parse_prefs_js_returns_copy(self, readonly_thunderbird_profile):
+        """Test mutating the result doesn't affect later calls."""
+        prefs = parse_prefs_js(readonly_thunderbird_profile)
+        prefs.clear()
+
+        assert parse_prefs_js(readonly_thunderbird_profile) != {}
+
+    def test_parse_prefs_js_in_writable_copy(self, mock_thunderbird_profile):
+        """Test a profile copy's server directories point into the copy."""
+        prefs = parse_prefs_js(mock_thunderbird_profile)
+
+        for key in ("mail.server.server1.directory", "mail.server.server2.directory"):
+            assert prefs[key].startswith(str(mock_thunderbird_profile))
+
 
 class TestGetAccountServerMapping:
-    def test_get_mapping(self, mock_thunderbird_profile):
+    def test_get_mapping(self, readonly_thunderbird_profile):
         """Test getting server hostname to account ID mapping."""
-        mapping = get_account_server_mapping(mock_thunderbird_profile)
+        mapping = get_account_server_mapping(readonly_thunderbird_profile)
 
         assert "imap.example.com" in mapping
         assert "local" in mapping
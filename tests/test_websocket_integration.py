@@ -14,48 +14,51 @@ for connection.
 import asyncio
 import contextlib
 import os
-import tempfile
 
 import pytest
+import pytest_asyncio
 
 from mailmap.config import WebSocketConfig
 from mailmap.database import Database
 from mailmap.protocol import Action
 from mailmap.websocket_server import WebSocketServer
 
-# Skip all tests if token not configured
-pytestmark = pytest.mark.skipif(
-    not os.environ.get("MAILMAP_WS_TOKEN"),
-    reason="MAILMAP_WS_TOKEN not set - skipping WebSocket integration tests"
-)
+pytestmark = [
+    # Skip all tests if token not configured
+    pytest.mark.skipif(
+        not os.environ.get("MAILMAP_WS_TOKEN"),
+        reason="MAILMAP_WS_TOKEN not set - skipping WebSocket integration tests"
+    ),
+    # Share the module-scoped server's event loop
+    pytest.mark.asyncio(loop_scope="module"),
+]
 
 
-@pytest.mark.asyncio
-async def test_websocket_extension_integration():
-    """Test WebSocket communication with Thunderbird extension.
+async def _shutdown(server: WebSocketServer, server_task: asyncio.Task) -> None:
+    """Stop the server and cancel its task concurrently."""
+    async def cancel() -> None:
+        server_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await server_task
+
+    await asyncio.gather(server.stop(), cancel(), return_exceptions=True)
 
-    This test:
-    1. Starts a WebSocket server with auth token
-    2. Waits for extension to connect
-    3. Sends ping command (validates token auth)
-    4. Lists folders from Thunderbird
-    5. Lists accounts from Thunderbird
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def ws_server(tmp_path_factory):
+    """Start a WebSocket server and wait for the extension to connect.
+
+    Shared by all tests in this module so the extension's reconnect delay
+    is only paid once.
     """
     ws_token = os.environ.get("MAILMAP_WS_TOKEN")
     assert ws_token, "MAILMAP_WS_TOKEN must be set"
 
-    # Create temp database
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-
-    db = Database(db_path)
-    db.connect()
-    db.init_schema()
+    tmp_path = tmp_path_factory.mktemp("ws_integration")
 
     # Create temp categories file
-    cat_path = tempfile.mktemp(suffix=".txt")
-    with open(cat_path, "w") as f:
-        f.write("Test: Test category\n")
+    cat_path = tmp_path / "cats.txt"
+    cat_path.write_text("Test: Test category\n")
 
     config = WebSocketConfig(
         enabled=True,
@@ -64,57 +67,49 @@ async def test_websocket_extension_integration():
         auth_token=ws_token
     )
 
-    server = WebSocketServer(config, db, cat_path)
-    server_task = asyncio.create_task(server.start())
+    async with contextlib.AsyncExitStack() as stack:
+        # The extension never reads persisted data, so keep the DB in memory
+        db = stack.enter_context(Database(":memory:"))
+        server = WebSocketServer(config, db, cat_path)
+        server_task = asyncio.create_task(server.start())
+        stack.push_async_callback(_shutdown, server, server_task)
 
-    try:
         # Wait for server to start and extension to connect (up to 10 seconds)
         print("\nWaiting for extension to connect (up to 10 seconds)...")
-        for i in range(20):
-            await asyncio.sleep(0.5)
-            if server.is_connected:
-                print(f"Extension connected after {(i+1)*0.5:.1f}s")
-                break
-        else:
+        try:
+            await asyncio.wait_for(server.connected_event.wait(), timeout=10.0)
+        except TimeoutError:
             pytest.fail(
                 "Extension did not connect within 10 seconds. "
                 "Is Thunderbird running with the extension?"
             )
 
-        # Test 1: Ping (validates token authentication)
-        print("Testing PING with token auth...")
-        response = await server.send_request(Action.PING, {}, timeout=5)
-        assert response is not None, "No response from extension"
-        assert response.ok is True, f"Ping failed: {response.error}"
-        print("  PING: OK")
-
-        # Test 2: List folders
-        print("Testing LIST_FOLDERS...")
-        response = await server.send_request(Action.LIST_FOLDERS, {}, timeout=10)
-        assert response is not None, "No response from extension"
-        assert response.ok is True, f"List folders failed: {response.error}"
-        assert "folders" in response.result
-        folders = response.result["folders"]
-        assert len(folders) > 0, "No folders returned"
-        print(f"  LIST_FOLDERS: OK ({len(folders)} folders)")
-
-        # Test 3: List accounts
-        print("Testing LIST_ACCOUNTS...")
-        response = await server.send_request(Action.LIST_ACCOUNTS, {}, timeout=5)
-        assert response is not None, "No response from extension"
-        assert response.ok is True, f"List accounts failed: {response.error}"
-        assert "accounts" in response.result
-        accounts = response.result["accounts"]
-        print(f"  LIST_ACCOUNTS: OK ({len(accounts)} accounts)")
-
-        print("\nAll integration tests passed!")
-
-    finally:
-        # Cleanup
-        await server.stop()
-        server_task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await server_task
-        db.close()
-        os.unlink(db_path)
-        os.unlink(cat_path)
+        yield server
+
+
+async def test_ping(ws_server):
+    """Ping the extension (validates token authentication)."""
+    response = await ws_server.send_request(Action.PING, {}, timeout=5)
+    assert response is not None, "No response from extension"
+    assert response.ok is True, f"Ping failed: {response.error}"
+
+
+async def test_list_folders(ws_server):
+    """List folders from Thunderbird."""
+    response = await ws_server.send_request(Action.LIST_FOLDERS, {}, timeout=10)
+    assert response is not None, "No response from extension"
+    assert response.ok is True, f"List folders failed: {response.error}"
+    assert "folders" in response.result
+    folders = response.result["folders"]
+    assert len(folders) > 0, "No folders returned"
+    print(f"  LIST_FOLDERS: {len(folders)} folders")
+
+
+async def test_list_accounts(ws_server):
+    """List accounts from Thunderbird."""
+    response = await ws_server.send_request(Action.LIST_ACCOUNTS, {}, timeout=5)
+    assert response is not None, "No response from extension"
+    assert response.ok is True, f"List accounts failed: {response.error}"
+    assert "accounts" in response.result
+    accounts = response.result["accounts"]
+    print(f"  LIST_ACCOUNTS: {len(accounts)} accounts")
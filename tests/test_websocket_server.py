@@ -3,290 +3,256 @@
 import asyncio
 import contextlib
 import json
+import socket
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+import pytest_asyncio
 import websockets
 
 from mailmap.categories import Category, save_categories
 from mailmap.config import WebSocketConfig
 from mailmap.database import Database
 from mailmap.protocol import Action, Event, Request, Response, ServerEvent, parse_message
-from mailmap.websocket_server import WebSocketServer
+from mailmap.websocket_server import WebSocketServer, start_websocket_and_wait
 
+try:
+    import orjson
+except ImportError:
+    # Same interface, slower: dumps returns bytes like orjson's, so _dumps
+    # decodes both the same way (the encode/decode round-trip is deliberate)
+    orjson = SimpleNamespace(dumps=lambda obj: json.dumps(obj).encode(), loads=json.loads)
 
-class TestProtocol:
-    """Tests for protocol message types."""
 
-    def test_request_to_json(self):
-        req = Request(id="123", action="ping", params={"foo": "bar"})
-        data = json.loads(req.to_json())
-        assert data["id"] == "123"
-        assert data["action"] == "ping"
-        assert data["params"] == {"foo": "bar"}
-
-    def test_request_from_dict(self):
-        req = Request.from_dict({"id": "123", "action": "test", "params": {"x": 1}})
-        assert req.id == "123"
-        assert req.action == "test"
-        assert req.params == {"x": 1}
-
-    def test_request_with_token(self):
-        req = Request(id="123", action="ping", params={}, token="secret123")
-        data = json.loads(req.to_json())
-        assert data["token"] == "secret123"
-
-    def test_request_without_token(self):
-        req = Request(id="123", action="ping", params={})
-        data = json.loads(req.to_json())
-        assert "token" not in data
-
-    def test_request_from_dict_with_token(self):
-        req = Request.from_dict({"id": "123", "action": "test", "params": {}, "token": "abc"})
-        assert req.token == "abc"
-
-    def test_request_from_dict_without_token(self):
-        req = Request.from_dict({"id": "123", "action": "test", "params": {}})
-        assert req.token is None
-
-    def test_response_success(self):
-        resp = Response.success("123", {"result": "ok"})
-        assert resp.id == "123"
-        assert resp.ok is True
-        assert resp.result == {"result": "ok"}
-        assert resp.error is None
-
-    def test_response_failure(self):
-        resp = Response.failure("123", "Something went wrong")
-        assert resp.id == "123"
-        assert resp.ok is False
-        assert resp.error == "Something went wrong"
-
-    def test_response_to_json_success(self):
-        resp = Response.success("123", {"data": "test"})
-        data = json.loads(resp.to_json())
-        assert data["id"] == "123"
-        assert data["ok"] is True
-        assert data["result"] == {"data": "test"}
-        assert "error" not in data
-
-    def test_response_to_json_failure(self):
-        resp = Response.failure("123", "Error message")
-        data = json.loads(resp.to_json())
-        assert data["id"] == "123"
-        assert data["ok"] is False
-        assert data["error"] == "Error message"
-        assert "result" not in data
-
-    def test_server_event_to_json(self):
-        event = ServerEvent(event="emailClassified", data={"folder": "Inbox"})
-        data = json.loads(event.to_json())
-        assert data["event"] == "emailClassified"
-        assert data["data"] == {"folder": "Inbox"}
-
-    def test_parse_message_request(self):
-        raw = '{"id": "1", "action": "ping", "params": {}}'
-        msg = parse_message(raw)
-        assert isinstance(msg, Request)
-        assert msg.action == "ping"
+def _dumps(obj) -> str:
+    """Serialize to a str so clients send text frames, as the extension does."""
+    return orjson.dumps(obj).decode()
 
-    def test_parse_message_response(self):
-        raw = '{"id": "1", "ok": true, "result": {}}'
-        msg = parse_message(raw)
-        assert isinstance(msg, Response)
-        assert msg.ok is True
 
-    def test_parse_message_invalid_json(self):
-        msg = parse_message("not json")
-        assert msg is None
+# Request payloads that never vary, serialized once
+PING_PAYLOAD = _dumps({"id": "test-ping", "action": "ping", "params": {}})
+GET_FOLDERS_PAYLOAD = _dumps({"id": "test-folders", "action": "getFolders", "params": {}})
+GET_STATS_PAYLOAD = _dumps({"id": "test-stats", "action": "getStats", "params": {}})
+UNKNOWN_ACTION_PAYLOAD = _dumps({"id": "test-unknown", "action": "unknownAction", "params": {}})
 
-    def test_parse_message_unknown_format(self):
-        msg = parse_message('{"foo": "bar"}')
-        assert msg is None
 
+def _free_port() -> int:
+    """Return a port the OS reports as unused, so parallel workers never collide."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
 
-class TestWebSocketServer:
-    """Tests for WebSocket server."""
 
-    @pytest.fixture
-    def db(self, tmp_path):
-        """Create a test database."""
-        db_path = tmp_path / "test.db"
-        db = Database(str(db_path))
-        db.connect()
-        db.init_schema()
-        yield db
-        db.close()
+def _empty_categories_file(directory: Path) -> Path:
+    """Write an empty categories file into directory."""
+    cat_path = directory / "categories.txt"
+    save_categories([], cat_path)
+    return cat_path
 
-    @pytest.fixture
-    def categories_file(self, tmp_path):
-        """Create a test categories file."""
-        cat_path = tmp_path / "categories.txt"
-        # Create an empty categories file
-        save_categories([], cat_path)
-        return cat_path
 
-    @pytest.fixture
-    def config(self):
-        """Create test config with random port."""
-        import random
-        port = random.randint(19000, 19999)
-        return WebSocketConfig(enabled=True, host="127.0.0.1", port=port)
+async def _stop_server(server: WebSocketServer, server_task: asyncio.Task) -> None:
+    """Stop a server started with create_task(server.start())."""
+    await server.stop()
+    server_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await server_task
 
-    @pytest.fixture
-    async def server(self, config, db, categories_file):
-        """Create and start a test server."""
-        server = WebSocketServer(config, db, categories_file)
-        server_task = asyncio.create_task(server.start())
-        await asyncio.sleep(0.2)  # Wait for server to start
+
+@contextlib.asynccontextmanager
+async def _serve(config: WebSocketConfig, db: Database, categories_file: Path):
+    """Run a server until the block exits, yielding it once it accepts connections."""
+    server = WebSocketServer(config, db, categories_file)
+    server_task = asyncio.create_task(server.start())
+    try:
+        await asyncio.wait_for(server.ready_event.wait(), timeout=2)
         yield server
-        await server.stop()
-        server_task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await server_task
+    finally:
+        await _stop_server(server, server_task)
 
-    @pytest.mark.asyncio
-    async def test_server_starts(self, config, db, categories_file):
-        """Test server starts and accepts connections."""
-        server = WebSocketServer(config, db, categories_file)
-        server_task = asyncio.create_task(server.start())
-        await asyncio.sleep(0.2)
 
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            # Should receive connected event
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            data = json.loads(msg)
-            assert data["event"] == "connected"
-            assert "clientId" in data["data"]
+@dataclass
+class ServerEnv:
+    """A running test server together with the objects it was built from."""
+    server: WebSocketServer
+    config: WebSocketConfig
+    db: Database
+    categories_file: Path
 
-        await server.stop()
-        server_task.cancel()
 
-    @pytest.mark.asyncio
-    async def test_client_count(self, server, config):
-        """Test client count tracking."""
-        assert server.client_count == 0
+@pytest.fixture(scope="class")
+def db(tmp_path_factory):
+    """Share one database per test class so the schema is created only once.
 
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
-            await asyncio.sleep(0.1)
-            assert server.client_count == 1
+    Database methods commit as they go, so tests in a class see each
+    other's rows and must not depend on an empty database.
+    """
+    with Database(tmp_path_factory.mktemp("db") / "test.db") as db:
+        yield db
 
-        await asyncio.sleep(0.1)
-        assert server.client_count == 0
 
-    @pytest.mark.asyncio
-    async def test_ping_action(self, server, config):
-        """Test ping action."""
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
+async def _recv(ws, timeout: float = 2.0):
+    """Receive one message, failing the test if none arrives within timeout."""
+    async with asyncio.timeout(timeout):
+        return await ws.recv()
 
-            await ws.send(json.dumps({
-                "id": "test-ping",
-                "action": "ping",
-                "params": {}
-            }))
 
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            resp = json.loads(msg)
-            assert resp["id"] == "test-ping"
-            assert resp["ok"] is True
-            assert resp["result"]["pong"] is True
+async def _wait_until(predicate, timeout: float = 2.0) -> None:
+    """Poll predicate every 5 ms until it holds or timeout expires."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
 
-    @pytest.mark.asyncio
-    async def test_get_folders_action(self, server, config, categories_file):
-        """Test getFolders action."""
-        # Add a test category to the file
-        categories = [Category(name="TestFolder", description="Test folder")]
-        save_categories(categories, categories_file)
 
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
+class TestProtocol:
+    """Tests for protocol message types."""
+
+    @pytest.mark.parametrize("message,expected", [
+        (
+            Request(id="123", action="ping", params={"foo": "bar"}),
+            {"id": "123", "action": "ping", "params": {"foo": "bar"}},
+        ),
+        (
+            Request(id="123", action="ping", params={}, token="secret123"),
+            {"id": "123", "action": "ping", "params": {}, "token": "secret123"},
+        ),
+        (
+            Response.success("123", {"data": "test"}),
+            {"id": "123", "ok": True, "result": {"data": "test"}},
+        ),
+        (
+            Response.failure("123", "Error message"),
+            {"id": "123", "ok": False, "error": "Error message"},
+        ),
+        (
+            ServerEvent(event="emailClassified", data={"folder": "Inbox"}),
+            {"event": "emailClassified", "data": {"folder": "Inbox"}},
+        ),
+    ], ids=[
+        "request", "request-with-token", "response-success", "response-failure", "server-event",
+    ])
+    def test_to_json(self, message, expected):
+        assert json.loads(message.to_json()) == expected
+
+    @pytest.mark.parametrize("data,token", [
+        ({"id": "123", "action": "test", "params": {"x": 1}, "token": "abc"}, "abc"),
+        ({"id": "123", "action": "test", "params": {"x": 1}}, None),
+    ], ids=["with-token", "without-token"])
+    def test_request_from_dict(self, data, token):
+        req = Request.from_dict(data)
+        assert (req.id, req.action, req.params, req.token) == ("123", "test", {"x": 1}, token)
+
+    @pytest.mark.parametrize("resp,ok,result,error", [
+        (Response.success("123", {"result": "ok"}), True, {"result": "ok"}, None),
+        (Response.failure("123", "Something went wrong"), False, None, "Something went wrong"),
+    ], ids=["success", "failure"])
+    def test_response_factories(self, resp, ok, result, error):
+        assert (resp.id, resp.ok, resp.result, resp.error) == ("123", ok, result, error)
+
+    @pytest.mark.parametrize("raw,expected_type,attrs", [
+        ('{"id": "1", "action": "ping", "params": {}}', Request, {"action": "ping"}),
+        ('{"id": "1", "ok": true, "result": {}}', Response, {"ok": True}),
+        ("not json", type(None), {}),
+        ('{"foo": "bar"}', type(None), {}),
+    ], ids=["request", "response", "invalid-json", "unknown-format"])
+    def test_parse_message(self, raw, expected_type, attrs):
+        msg = parse_message(raw)
+        assert isinstance(msg, expected_type)
+        for name, value in attrs.items():
+            assert getattr(msg, name) == value
 
-            await ws.send(json.dumps({
-                "id": "test-folders",
-                "action": "getFolders",
-                "params": {}
-            }))
 
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            resp = json.loads(msg)
-            assert resp["id"] == "test-folders"
-            assert resp["ok"] is True
-            assert "folders" in resp["result"]
-            assert "TestFolder" in resp["result"]["folders"]
+class TestWebSocketServer:
+    """Tests for WebSocket server."""
+
+    @pytest.fixture
+    async def env(self, tmp_path, db):
+        """Start a server on an OS-assigned port with an empty categories file."""
+        categories_file = _empty_categories_file(tmp_path)
+        config = WebSocketConfig(enabled=True, host="127.0.0.1", port=_free_port())
+        async with _serve(config, db, categories_file) as server:
+            yield ServerEnv(server, config, db, categories_file)
 
     @pytest.mark.asyncio
-    async def test_get_stats_action(self, server, config):
-        """Test getStats action."""
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
+    async def test_server_starts(self, env):
+        """Test server starts and accepts connections."""
+        async with websockets.connect(env.config.url) as ws:
+            # Should receive connected event
+            msg = await _recv(ws)
+            data = orjson.loads(msg)
+            assert data["event"] == "connected"
+            assert "clientId" in data["data"]
 
-            await ws.send(json.dumps({
-                "id": "test-stats",
-                "action": "getStats",
-                "params": {}
-            }))
+    @pytest.mark.asyncio
+    async def test_silent_connection_skips_connected_event(self, env):
+        """Test ?silent=1 clients receive no connected event."""
+        async with websockets.connect(f"{env.config.url}/?silent=1") as ws:
+            await ws.send(PING_PAYLOAD)
 
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            resp = json.loads(msg)
-            assert resp["id"] == "test-stats"
-            assert resp["ok"] is True
-            assert "stats" in resp["result"]
+            # First message is the ping response, not the connected event
+            msg = await _recv(ws)
+            assert orjson.loads(msg)["id"] == "test-ping"
 
     @pytest.mark.asyncio
-    async def test_unknown_action(self, server, config):
-        """Test unknown action returns error."""
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
+    async def test_client_count(self, env):
+        """Test client count tracking."""
+        assert env.server.client_count == 0
 
-            await ws.send(json.dumps({
-                "id": "test-unknown",
-                "action": "unknownAction",
-                "params": {}
-            }))
+        async with websockets.connect(f"{env.config.url}/?silent=1"):
+            await _wait_until(lambda: env.server.client_count == 1)
 
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            resp = json.loads(msg)
-            assert resp["id"] == "test-unknown"
-            assert resp["ok"] is False
-            assert "Unknown action" in resp["error"]
+        await _wait_until(lambda: env.server.client_count == 0)
 
     @pytest.mark.asyncio
-    async def test_broadcast_event(self, server, config):
+    async def test_broadcast_event(self, env):
         """Test broadcasting events to multiple clients."""
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws1:
-            await ws1.recv()  # connected event
+        url = f"{env.config.url}/?silent=1"
+        async with websockets.connect(url) as ws1, websockets.connect(url) as ws2:
+            await _wait_until(lambda: env.server.client_count == 2)
+
+            # Broadcast event
+            await env.server.broadcast_event(Event.EMAIL_CLASSIFIED, {
+                "messageId": "<test@example.com>",
+                "folder": "TestFolder",
+                "confidence": 0.95
+            })
 
-            async with websockets.connect(f"ws://{config.host}:{config.port}") as ws2:
-                await ws2.recv()  # connected event
+            # Both clients should receive
+            msg1, msg2 = await asyncio.gather(_recv(ws1), _recv(ws2))
 
-                # Broadcast event
-                await server.broadcast_event(Event.EMAIL_CLASSIFIED, {
-                    "messageId": "<test@example.com>",
-                    "folder": "TestFolder",
-                    "confidence": 0.95
-                })
+            data1 = orjson.loads(msg1)
+            data2 = orjson.loads(msg2)
 
-                # Both clients should receive
-                msg1 = await asyncio.wait_for(ws1.recv(), timeout=2)
-                msg2 = await asyncio.wait_for(ws2.recv(), timeout=2)
+            assert data1["event"] == "emailClassified"
+            assert data1["data"]["folder"] == "TestFolder"
+            assert data2["event"] == "emailClassified"
 
-                data1 = json.loads(msg1)
-                data2 = json.loads(msg2)
+    @pytest.mark.asyncio
+    async def test_broadcast_many_clients(self, env):
+        """Test a broadcast reaches every one of many clients promptly."""
+        url = f"{env.config.url}/?silent=1"
+        clients = await asyncio.gather(*(websockets.connect(url) for _ in range(50)))
+        try:
+            await _wait_until(lambda: env.server.client_count == 50)
 
-                assert data1["event"] == "emailClassified"
-                assert data1["data"]["folder"] == "TestFolder"
-                assert data2["event"] == "emailClassified"
+            async with asyncio.timeout(2):
+                await env.server.broadcast_event(Event.EMAIL_CLASSIFIED, {"folder": "TestFolder"})
+                messages = await asyncio.gather(*(ws.recv() for ws in clients))
+
+            assert all(orjson.loads(msg)["event"] == "emailClassified" for msg in messages)
+        finally:
+            await asyncio.gather(*(ws.close() for ws in clients))
 
     @pytest.mark.asyncio
-    async def test_send_request_to_client(self, server, config):
+    async def test_send_request_to_client(self, env):
         """Test server sending request to client."""
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
+        async with websockets.connect(f"{env.config.url}/?silent=1") as ws:
+            await _wait_until(lambda: env.server.is_connected)
 
             # Start server request in background
             async def server_request():
-                return await server.send_request(
+                return await env.server.send_request(
                     Action.LIST_FOLDERS,
                     {"accountId": "test"},
                     timeout=5
@@ -295,12 +261,12 @@ class TestWebSocketServer:
             request_task = asyncio.create_task(server_request())
 
             # Client receives request and responds
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            req = json.loads(msg)
+            msg = await _recv(ws)
+            req = orjson.loads(msg)
             assert req["action"] == "listFolders"
 
             # Send response
-            await ws.send(json.dumps({
+            await ws.send(_dumps({
                 "id": req["id"],
                 "ok": True,
                 "result": {"folders": ["Inbox", "Sent"]}
@@ -313,13 +279,13 @@ class TestWebSocketServer:
             assert response.result["folders"] == ["Inbox", "Sent"]
 
     @pytest.mark.asyncio
-    async def test_send_request_timeout(self, server, config):
+    async def test_send_request_timeout(self, env):
         """Test request timeout when client doesn't respond."""
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()  # connected event
+        async with websockets.connect(f"{env.config.url}/?silent=1"):
+            await _wait_until(lambda: env.server.is_connected)
 
             # Send request with short timeout, don't respond
-            response = await server.send_request(
+            response = await env.server.send_request(
                 Action.PING,
                 {},
                 timeout=0.5
@@ -328,164 +294,271 @@ class TestWebSocketServer:
             assert response is None
 
     @pytest.mark.asyncio
-    async def test_multiple_clients(self, server, config):
+    async def test_multiple_clients(self, env):
         """Test multiple simultaneous clients."""
-        clients = []
-        for _ in range(3):
-            ws = await websockets.connect(f"ws://{config.host}:{config.port}")
-            await ws.recv()  # connected event
-            clients.append(ws)
+        async def open_one():
+            return await websockets.connect(f"{env.config.url}/?silent=1")
+
+        clients = await asyncio.gather(*(open_one() for _ in range(3)))
 
-        await asyncio.sleep(0.1)
-        assert server.client_count == 3
+        await _wait_until(lambda: env.server.client_count == 3)
 
         # Each client can send requests
-        for i, ws in enumerate(clients):
-            await ws.send(json.dumps({
+        async def ping(i, ws):
+            await ws.send(_dumps({
                 "id": f"ping-{i}",
                 "action": "ping",
                 "params": {}
             }))
-            msg = await asyncio.wait_for(ws.recv(), timeout=2)
-            resp = json.loads(msg)
-            assert resp["ok"] is True
+            msg = await _recv(ws)
+            return orjson.loads(msg)
 
-        for ws in clients:
-            await ws.close()
+        responses = await asyncio.gather(*(ping(i, ws) for i, ws in enumerate(clients)))
+        assert [resp["id"] for resp in responses] == ["ping-0", "ping-1", "ping-2"]
+        assert all(resp["ok"] is True for resp in responses)
+
+        await asyncio.gather(*(ws.close() for ws in clients))
 
     @pytest.mark.asyncio
-    async def test_is_connected_property(self, server, config):
+    async def test_is_connected_property(self, env):
         """Test is_connected property."""
-        assert server.is_connected is False
+        assert env.server.is_connected is False
+
+        async with websockets.connect(f"{env.config.url}/?silent=1"):
+            await _wait_until(lambda: env.server.is_connected)
+
+        await _wait_until(lambda: not env.server.is_connected)
+
+    @pytest.mark.asyncio
+    async def test_connected_event(self, env):
+        """Test connected_event tracks whether any client is connected."""
+        assert not env.server.connected_event.is_set()
+
+        async with websockets.connect(env.config.url):
+            await asyncio.wait_for(env.server.connected_event.wait(), timeout=2)
+
+        await _wait_until(lambda: not env.server.connected_event.is_set())
+
+    @pytest.mark.asyncio
+    async def test_ready_event(self, db, tmp_path):
+        """Test ready_event is set while the server is listening."""
+        config = WebSocketConfig(enabled=True, host="127.0.0.1", port=_free_port())
+        server = WebSocketServer(config, db, _empty_categories_file(tmp_path))
+        assert not server.ready_event.is_set()
+
+        server_task = asyncio.create_task(server.start())
+        await asyncio.wait_for(server.ready_event.wait(), timeout=2)
+
+        await _stop_server(server, server_task)
+        assert not server.ready_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_start_websocket_and_wait(self, db, tmp_path):
+        """Test start_websocket_and_wait returns once a client connects."""
+        config = WebSocketConfig(enabled=True, host="127.0.0.1", port=_free_port())
+
+        async def connect_client():
+            # Retry until the server is listening
+            while True:
+                try:
+                    return await websockets.connect(config.url)
+                except OSError:
+                    await asyncio.sleep(0.005)
+
+        client_task = asyncio.create_task(connect_client())
+        result = await start_websocket_and_wait(
+            config, db, _empty_categories_file(tmp_path), timeout=5
+        )
+        ws = await client_task
+
+        assert result is not None
+        server, server_task = result
+        assert server.is_connected
+
+        await ws.close()
+        await _stop_server(server, server_task)
+
+
+@pytest.fixture(scope="module")
+def shared_categories_file(tmp_path_factory):
+    """Create a categories file for the shared server."""
+    return _empty_categories_file(tmp_path_factory.mktemp("ws_shared"))
+
 
-        async with websockets.connect(f"ws://{config.host}:{config.port}") as ws:
-            await ws.recv()
-            await asyncio.sleep(0.1)
-            assert server.is_connected is True
+@pytest.fixture(scope="module")
+def shared_config():
+    """Create config for the shared server with an OS-assigned port."""
+    return WebSocketConfig(enabled=True, host="127.0.0.1", port=_free_port())
 
-        await asyncio.sleep(0.1)
-        assert server.is_connected is False
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_server(shared_config, shared_categories_file, tmp_path_factory):
+    """Start one server for request/response tests that don't track connections."""
+    with Database(tmp_path_factory.mktemp("ws_shared_db") / "test.db") as db:
+        server = WebSocketServer(shared_config, db, shared_categories_file)
+        server_task = asyncio.create_task(server.start())
+        await asyncio.wait_for(server.ready_event.wait(), timeout=2)
+        yield server
+        await _stop_server(server, server_task)
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def client(shared_server, shared_config):
+    """Connect a silent client to the shared server."""
+    url = f"{shared_config.url}/?silent=1"
+    async with websockets.connect(url) as ws:
+        yield ws
+
+
+class TestWebSocketServerActions:
+    """Request/response tests against the shared server."""
+
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+    async def test_ping_action(self, client):
+        """Test ping action."""
+        await client.send(PING_PAYLOAD)
+
+        msg = await _recv(client)
+        resp = orjson.loads(msg)
+        assert resp["id"] == "test-ping"
+        assert resp["ok"] is True
+        assert resp["result"]["pong"] is True
+
+    async def test_binary_frame_request(self, client):
+        """Test a request sent as a binary frame is decoded as UTF-8."""
+        await client.send(PING_PAYLOAD.encode())
+
+        msg = await _recv(client)
+        resp = orjson.loads(msg)
+        assert resp["id"] == "test-ping"
+        assert resp["result"]["pong"] is True
+
+    async def test_get_folders_action(self, client, shared_categories_file):
+        """Test getFolders action."""
+        # Add a test category to the file
+        categories = [Category(name="TestFolder", description="Test folder")]
+        save_categories(categories, shared_categories_file)
+
+        await client.send(GET_FOLDERS_PAYLOAD)
+
+        msg = await _recv(client)
+        resp = orjson.loads(msg)
+        assert resp["id"] == "test-folders"
+        assert resp["ok"] is True
+        assert "folders" in resp["result"]
+        assert "TestFolder" in resp["result"]["folders"]
+
+    async def test_get_stats_action(self, client):
+        """Test getStats action."""
+        await client.send(GET_STATS_PAYLOAD)
+
+        msg = await _recv(client)
+        resp = orjson.loads(msg)
+        assert resp["id"] == "test-stats"
+        assert resp["ok"] is True
+        assert "stats" in resp["result"]
+
+    async def test_unknown_action(self, client):
+        """Test unknown action returns error."""
+        await client.send(UNKNOWN_ACTION_PAYLOAD)
+
+        msg = await _recv(client)
+        resp = orjson.loads(msg)
+        assert resp["id"] == "test-unknown"
+        assert resp["ok"] is False
+        assert "Unknown action" in resp["error"]
 
 
 class TestWebSocketServerAuth:
     """Tests for WebSocket server authentication."""
 
-    @pytest.fixture
-    def db(self, tmp_path):
-        """Create a test database."""
-        db_path = tmp_path / "test.db"
-        db = Database(str(db_path))
-        db.connect()
-        db.init_schema()
-        yield db
-        db.close()
-
     @pytest.fixture
     def categories_file(self, tmp_path):
         """Create a test categories file."""
-        cat_path = tmp_path / "categories.txt"
-        save_categories([], cat_path)
-        return cat_path
+        return _empty_categories_file(tmp_path)
 
     @pytest.fixture
     def config_with_token(self):
         """Create test config with auth token."""
-        import random
-        port = random.randint(19000, 19999)
         return WebSocketConfig(
             enabled=True,
             host="127.0.0.1",
-            port=port,
+            port=_free_port(),
             auth_token="test-secret-token-12345"
         )
 
     @pytest.fixture
     def config_without_token(self):
         """Create test config without auth token."""
-        import random
-        port = random.randint(19000, 19999)
-        return WebSocketConfig(enabled=True, host="127.0.0.1", port=port)
+        return WebSocketConfig(enabled=True, host="127.0.0.1", port=_free_port())
 
     @pytest.mark.asyncio
     async def test_request_includes_auth_token(self, config_with_token, db, categories_file):
         """Test that server requests include auth token when configured."""
-        server = WebSocketServer(config_with_token, db, categories_file)
-        server_task = asyncio.create_task(server.start())
-        await asyncio.sleep(0.2)
-
-        try:
-            async with websockets.connect(
-                f"ws://{config_with_token.host}:{config_with_token.port}"
-            ) as ws:
-                await ws.recv()  # connected event
+        async with (
+            _serve(config_with_token, db, categories_file) as server,
+            websockets.connect(f"{config_with_token.url}/?silent=1") as ws,
+        ):
+            await _wait_until(lambda: server.is_connected)
 
-                # Start server request in background
-                async def server_request():
-                    return await server.send_request(Action.PING, {}, timeout=5)
+            # Start server request in background
+            async def server_request():
+                return await server.send_request(Action.PING, {}, timeout=5)
 
-                request_task = asyncio.create_task(server_request())
+            request_task = asyncio.create_task(server_request())
 
-                # Client receives request - verify it has token
-                msg = await asyncio.wait_for(ws.recv(), timeout=2)
-                req = json.loads(msg)
+            # Client receives request - verify it has token
+            msg = await _recv(ws)
+            req = orjson.loads(msg)
 
-                assert "token" in req
-                assert req["token"] == "test-secret-token-12345"
-                assert req["action"] == "ping"
+            assert "token" in req
+            assert req["token"] == "test-secret-token-12345"
+            assert req["action"] == "ping"
 
-                # Send response
-                await ws.send(json.dumps({
-                    "id": req["id"],
-                    "ok": True,
-                    "result": {"pong": True}
-                }))
+            # Send response
+            await ws.send(_dumps({
+                "id": req["id"],
+                "ok": True,
+                "result": {"pong": True}
+            }))
 
-                response = await request_task
-                assert response.ok is True
-        finally:
-            await server.stop()
-            server_task.cancel()
+            response = await request_task
+            assert response.ok is True
 
     @pytest.mark.asyncio
     async def test_request_without_token_when_not_configured(
         self, config_without_token, db, categories_file
     ):
         """Test that server requests don't include token when not configured."""
-        server = WebSocketServer(config_without_token, db, categories_file)
-        server_task = asyncio.create_task(server.start())
-        await asyncio.sleep(0.2)
+        async with (
+            _serve(config_without_token, db, categories_file) as server,
+            websockets.connect(f"{config_without_token.url}/?silent=1") as ws,
+        ):
+            await _wait_until(lambda: server.is_connected)
 
-        try:
-            async with websockets.connect(
-                f"ws://{config_without_token.host}:{config_without_token.port}"
-            ) as ws:
-                await ws.recv()  # connected event
-
-                # Start server request in background
-                async def server_request():
-                    return await server.send_request(Action.PING, {}, timeout=5)
+            # Start server request in background
+            async def server_request():
+                return await server.send_request(Action.PING, {}, timeout=5)
 
-                request_task = asyncio.create_task(server_request())
+            request_task = asyncio.create_task(server_request())
 
-                # Client receives request - verify no token
-                msg = await asyncio.wait_for(ws.recv(), timeout=2)
-                req = json.loads(msg)
+            # Client receives request - verify no token
+            msg = await _recv(ws)
+            req = orjson.loads(msg)
 
-                assert "token" not in req
-                assert req["action"] == "ping"
+            assert "token" not in req
+            assert req["action"] == "ping"
 
-                # Send response
-                await ws.send(json.dumps({
-                    "id": req["id"],
-                    "ok": True,
-                    "result": {"pong": True}
-                }))
+            # Send response
+            await ws.send(_dumps({
+                "id": req["id"],
+                "ok": True,
+                "result": {"pong": True}
+            }))
 
-                response = await request_task
-                assert response.ok is True
-        finally:
-            await server.stop()
-            server_task.cancel()
+            response = await request_task
+            assert response.ok is True
 
     @pytest.mark.asyncio
     async def test_connection_succeeds_without_header_auth(
@@ -496,58 +569,44 @@ class TestWebSocketServerAuth:
         Browser WebSockets can't send custom headers, so we don't require
         header-based auth. Security is enforced at the message level instead.
         """
-        server = WebSocketServer(config_with_token, db, categories_file)
-        server_task = asyncio.create_task(server.start())
-        await asyncio.sleep(0.2)
-
-        try:
-            # Connect without any auth header - should succeed
-            async with websockets.connect(
-                f"ws://{config_with_token.host}:{config_with_token.port}"
-            ) as ws:
-                msg = await asyncio.wait_for(ws.recv(), timeout=2)
-                data = json.loads(msg)
-                assert data["event"] == "connected"
-                assert "clientId" in data["data"]
-        finally:
-            await server.stop()
-            server_task.cancel()
+        # Connect without any auth header - should succeed
+        async with (
+            _serve(config_with_token, db, categories_file),
+            websockets.connect(config_with_token.url) as ws,
+        ):
+            msg = await _recv(ws)
+            data = orjson.loads(msg)
+            assert data["event"] == "connected"
+            assert "clientId" in data["data"]
 
     @pytest.mark.asyncio
     async def test_multiple_requests_all_include_token(
         self, config_with_token, db, categories_file
     ):
         """Test that all server requests include the auth token."""
-        server = WebSocketServer(config_with_token, db, categories_file)
-        server_task = asyncio.create_task(server.start())
-        await asyncio.sleep(0.2)
-
-        try:
-            async with websockets.connect(
-                f"ws://{config_with_token.host}:{config_with_token.port}"
-            ) as ws:
-                await ws.recv()  # connected event
+        async with (
+            _serve(config_with_token, db, categories_file) as server,
+            websockets.connect(f"{config_with_token.url}/?silent=1") as ws,
+        ):
+            await _wait_until(lambda: server.is_connected)
 
-                # Send multiple requests and verify each has token
-                for action in [Action.PING, Action.LIST_FOLDERS, Action.GET_MESSAGE]:
-                    async def server_request(a=action):
-                        return await server.send_request(a, {}, timeout=5)
+            # Send multiple requests and verify each has token
+            for action in [Action.PING, Action.LIST_FOLDERS, Action.GET_MESSAGE]:
+                async def server_request(a=action):
+                    return await server.send_request(a, {}, timeout=5)
 
-                    request_task = asyncio.create_task(server_request())
+                request_task = asyncio.create_task(server_request())
 
-                    msg = await asyncio.wait_for(ws.recv(), timeout=2)
-                    req = json.loads(msg)
+                msg = await _recv(ws)
+                req = orjson.loads(msg)
 
-                    assert req["token"] == "test-secret-token-12345"
+                assert req["token"] == "test-secret-token-12345"
 
-                    # Send response
-                    await ws.send(json.dumps({
-                        "id": req["id"],
-                        "ok": True,
-                        "result": {}
-                    }))
+                # Send response
+                await ws.send(_dumps({
+                    "id": req["id"],
+                    "ok": True,
+                    "result": {}
+                }))
 
-                    await request_task
-        finally:
-            await server.stop()
-            server_task.cancel()
+                await request_task